@@ -11,7 +11,7 @@ import redis
 from celery import Celery
 import asyncio
 
-from src.main import hybrid_workflow, run_batch_process
+from src.main import close_clients, hybrid_workflow, run_batch_process
 from src.utils import get_version_info, setup_logging
 from src.config.config_multi_agents import setup_agents
 
@@ -177,6 +177,12 @@ def verify_api_key(x_api_key: str = Header(...)) -> None:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
+@app.on_event("shutdown")
+async def shutdown_clients() -> None:
+    """Close shared cloud clients and stop their background token refresh."""
+    await close_clients()
+
+
 @app.get("/")
 async def read_root() -> Dict[str, Any]:
     """Root endpoint returning version information."""
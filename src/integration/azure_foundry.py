@@ -3,18 +3,173 @@ Azure AI Foundry integration module for FusionAiAutoCoder.
 Provides interfaces to connect with Azure AI services.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Hashable, List, Literal, Mapping, Optional, Tuple
+from collections import OrderedDict
+from types import MappingProxyType
 import os
 import logging
-import json
+import asyncio
+import threading
+import time
 import aiohttp
+import orjson
 from datetime import datetime, timezone  # type: ignore
 from datetime import timedelta
 
+from src.config.constants import CACHE_TTL, MAX_CACHE_SIZE
 from src.mocks.azure_ai_foundry import FoundryClient as MockFoundryClient
 
 logger: logging.Logger = logging.getLogger("fusion_ai")
 
+# Options forwarded to each Foundry endpoint, with their defaults
+_GENERATION_OPTION_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {"language": "python", "temperature": 0.7, "max_tokens": 1000}
+)
+_OPTIMIZATION_OPTION_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {"target": "performance", "language": "python"}
+)
+_NO_OPTIONS: Mapping[str, Any] = MappingProxyType({})
+
+
+def _select_options(
+    options: Mapping[str, Any], defaults: Mapping[str, Any]
+) -> Mapping[str, Any]:
+    """Pick the API options out of a caller mapping, filling in defaults.
+
+    A dict that already holds exactly the API keys, such as
+    TaskRequest.options, is passed through without copying.
+    """
+    if type(options) is dict and options.keys() == defaults.keys():
+        return options
+    return {key: options.get(key, default) for key, default in defaults.items()}
+
+
+class _CacheShard:
+    """One lock-guarded LRU partition of a RequestCache."""
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size: int = max_size
+        self.ttl: int = ttl
+        self.cache: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        # Counters are plain ints; RequestCache.get_stats builds the dict on demand
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._expirations: int = 0
+        self._insertions: int = 0
+        # Guards cache and counters; critical sections are O(1) dict operations
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on miss/expiry."""
+        now: float = time.monotonic()
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if now > expires_at:
+                del self.cache[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self.cache.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        expires_at: float = time.monotonic() + self.ttl
+        with self._lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            elif len(self.cache) >= self.max_size:
+                self.cache.popitem(last=False)
+                self._evictions += 1
+            self.cache[key] = (expires_at, value)
+            self._insertions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self.cache.clear()
+
+    def snapshot(self) -> Tuple[int, int, int, int, int, int]:
+        """Read hits, misses, evictions, expirations, insertions and size."""
+        with self._lock:
+            return (
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                self._insertions,
+                len(self.cache),
+            )
+
+
+class RequestCache:
+    """Thread-safe LRU cache with TTL for Azure AI Foundry responses.
+
+    Keys are spread over independently locked shards, as in diskcache's
+    FanoutCache, so concurrent callers rarely contend on one mutex. LRU
+    order and capacity are enforced per shard.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MAX_CACHE_SIZE,
+        ttl: int = CACHE_TTL,
+        shards: Optional[int] = None,
+    ) -> None:
+        if shards is None:
+            shards = int(os.environ.get("REQUEST_CACHE_SHARDS", "8"))
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError(f"Cache shard count must be a power of two: {shards}")
+        self.max_size: int = max_size
+        self.ttl: int = ttl
+        self._mask: int = shards - 1
+        self._shards: List[_CacheShard] = [
+            _CacheShard(max(1, max_size // shards), ttl) for _ in range(shards)
+        ]
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on miss/expiry."""
+        return self._shards[hash(key) & self._mask].get(key)
+
+    def set(self, key: Hashable, value: Dict[str, Any]) -> None:
+        """Store a response, evicting the shard's least recently used entry if full."""
+        self._shards[hash(key) & self._mask].set(key, value)
+
+    def clear(self) -> None:
+        """Drop all cached entries; statistics are kept."""
+        for shard in self._shards:
+            shard.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get a snapshot of cache statistics summed across shards."""
+        hits = misses = evictions = expirations = insertions = size = 0
+        for shard in self._shards:
+            h, m, ev, ex, ins, sz = shard.snapshot()
+            hits += h
+            misses += m
+            evictions += ev
+            expirations += ex
+            insertions += ins
+            size += sz
+        lookups: int = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "expirations": expirations,
+            "insertions": insertions,
+            "size": size,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
 
 class AzureAIFoundry:
     def __init__(self) -> None:
@@ -45,8 +200,14 @@ class AzureAIFoundry:
         # Initialize components
         self.auth_token: Optional[str] = None
         self.token_expiry: Optional[datetime] = None
+        # Monotonic deadline mirroring token_expiry for the per-request check
+        self.token_expires_at: float = 0.0
+        self._auth_refresh_task: Optional["asyncio.Task[None]"] = None
+        # Shared HTTP sessions so TCP/TLS connections are reused across
+        # requests; one per event loop since a session is bound to its loop
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
         self.mock_client: Optional[MockFoundryClient] = None
-        self.request_cache: Dict[str, Any] = {}
+        self.request_cache: RequestCache = RequestCache()
 
     async def dispatch_task(
         self, task_type: str, task_data: Dict[str, Any]
@@ -75,97 +236,138 @@ class AzureAIFoundry:
         return {"status": "not_implemented"}
 
     async def process_code_generation(
-        self, prompt: str, options: Optional[Dict[str, Any]] = None
+        self, prompt: str, options: Optional[Mapping[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Generate code using Azure AI Foundry."""
+        """Generate code using Azure AI Foundry.
+
+        options may be a superset such as the caller's task_data; only the
+        keys in _GENERATION_OPTION_DEFAULTS are sent to the API.
+        """
+        options = options or _NO_OPTIONS
         if self.use_mock:
-            return self._get_mock_client().generate_code(
-                prompt=prompt,
-                language=options.get("language", "python") if options else "python",
+            return await self._get_mock_client().generate_code_async(
+                prompt=prompt, language=options.get("language", "python")
             )
-
-        try:
-            await self._ensure_auth_token()
-            endpoint: str = f"{self.foundry_endpoint}/v1/code/generate"
-            payload: Dict[str, Any] = {"prompt": prompt, "options": options or {}}
-
-            # Check cache if enabled
-            cache_key: str = f"{endpoint}:{json.dumps(payload)}"
-            if self.cache_enabled:
-                if cache_key in self.request_cache:
-                    return self.request_cache[cache_key]
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint, headers=self._get_headers(), json=payload
-                ) as response:
-                    if response.status == 200:
-                        result: Dict[str, Any] = await response.json()
-
-                        # Cache successful response
-                        if self.cache_enabled:
-                            self.request_cache[cache_key] = result
-
-                        return result
-                    else:
-                        error_text: str = await response.text()
-                        logger.error(
-                            f"API call failed: {response.status} - {error_text}"
-                        )
-                        return {"error": f"API call failed: {error_text}"}
-
-        except Exception as e:
-            logger.error(f"Error in code generation: {str(e)}")
-            return {"error": str(e)}
+        return await self._process(
+            "generate", "prompt", prompt, options, _GENERATION_OPTION_DEFAULTS
+        )
 
     async def process_code_optimization(
-        self, code: str, options: Optional[Dict[str, Any]] = None
+        self, code: str, options: Optional[Mapping[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Optimize code using Azure AI Foundry."""
+        """Optimize code using Azure AI Foundry.
+
+        options may be a superset such as the caller's task_data; only the
+        keys in _OPTIMIZATION_OPTION_DEFAULTS are sent to the API.
+        """
+        options = options or _NO_OPTIONS
         if self.use_mock:
-            return self._get_mock_client().optimize_code(
+            return await self._get_mock_client().optimize_code_async(
                 code=code,
-                target=(
-                    options.get("target", "performance") if options else "performance"
-                ),
-                language=options.get("language", "python") if options else "python",
+                target=options.get("target", "performance"),
+                language=options.get("language", "python"),
             )
+        return await self._process(
+            "optimize", "code", code, options, _OPTIMIZATION_OPTION_DEFAULTS
+        )
 
+    async def _process(
+        self,
+        op: Literal["generate", "optimize"],
+        source_field: str,
+        source: str,
+        options: Mapping[str, Any],
+        option_defaults: Mapping[str, Any],
+    ) -> Dict[str, Any]:
+        """Send a code request to the Foundry API, with caching and auth."""
+        endpoint: str = f"{self.foundry_endpoint}/v1/code/{op}"
         try:
+            payload: Dict[str, Any] = {
+                source_field: source,
+                "options": _select_options(options, option_defaults),
+            }
+
+            # Serialize once; sorted keys make the body double as the cache key
+            body: bytes = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+
+            # Check cache if enabled
+            cache_key: bytes = self._get_cache_key(endpoint, body)
+            if self.cache_enabled:
+                cached: Optional[Dict[str, Any]] = self.request_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
             await self._ensure_auth_token()
-            endpoint: str = f"{self.foundry_endpoint}/v1/code/optimize"
-            payload: Dict[str, Any] = {"code": code, "options": options or {}}
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint, headers=self._get_headers(), json=payload
-                ) as response:
-                    if response.status == 200:
-                        result: Dict[str, Any] = await response.json()
-
-                        # Cache successful response
-                        if self.cache_enabled:
-                            cache_key: str = f"{endpoint}:{json.dumps(payload)}"
-                            self.request_cache[cache_key] = result
-
-                        return result
-                    else:
-                        error_text: str = await response.text()
-                        logger.error(
-                            f"API call failed: {response.status} - {error_text}"
-                        )
-                        return {"error": f"API call failed: {error_text}"}
+            session: aiohttp.ClientSession = self._get_session()
+            async with session.post(
+                endpoint, headers=self._get_headers(), data=body
+            ) as response:
+                if response.status == 200:
+                    result: Dict[str, Any] = orjson.loads(await response.read())
+
+                    # Cache successful response
+                    if self.cache_enabled:
+                        self.request_cache.set(cache_key, result)
+
+                    return result
+                else:
+                    error_text: str = await response.text()
+                    logger.error(
+                        "API call failed: %s - %s", response.status, error_text
+                    )
+                    return {"error": f"API call failed: {error_text}"}
 
         except Exception as e:
-            logger.error(f"Error in code optimization: {str(e)}")
+            logger.error("Error in code %s request: %s", op, e)
             return {"error": str(e)}
 
+    def get_cache_analytics(self) -> Dict[str, Any]:
+        """Get request cache statistics."""
+        return self.request_cache.get_stats()
+
+    @staticmethod
+    def _get_cache_key(endpoint: str, body: bytes) -> bytes:
+        """Build a request cache key from endpoint and key-sorted request body."""
+        return endpoint.encode() + b":" + body
+
     def _get_mock_client(self) -> MockFoundryClient:
         """Get or create mock client instance."""
         if not self.mock_client:
             self.mock_client = MockFoundryClient()
         return self.mock_client
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session for the running loop, creating it if needed."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        session: Optional[aiohttp.ClientSession] = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Release sessions whose loops are gone; their transports went too
+            for stale in [other for other in self._sessions if other.is_closed()]:
+                self._sessions.pop(stale).detach()
+            session = aiohttp.ClientSession()
+            self._sessions[loop] = session
+        return session
+
+    async def close(self) -> None:
+        """Stop background refresh and close the shared HTTP sessions.
+
+        The running loop's session is closed here; sessions on other live
+        loops are closed on their own loop.
+        """
+        self.stop_background_refresh()
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+        sessions, self._sessions = self._sessions, {}
+        for session_loop, session in sessions.items():
+            if session.closed:
+                continue
+            if session_loop is loop:
+                await session.close()
+            elif session_loop.is_closed():
+                session.detach()
+            else:
+                asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
         return {
@@ -173,30 +375,58 @@ class AzureAIFoundry:
             "Content-Type": "application/json",
         }
 
+    def start_background_refresh(self) -> None:
+        """Start refreshing the auth token ahead of expiry on the running loop.
+
+        Once started, requests find a warm token and _ensure_auth_token only
+        compares against a deadline. Safe to call on every request: a task
+        that is still running is kept, and one whose loop has closed is
+        replaced. No-op for the mock client.
+        """
+        if self.use_mock:
+            return
+        task: Optional["asyncio.Task[None]"] = self._auth_refresh_task
+        if task is None or task.done() or task.get_loop().is_closed():
+            self._auth_refresh_task = asyncio.get_running_loop().create_task(
+                self._refresh_loop()
+            )
+
+    def stop_background_refresh(self) -> None:
+        """Cancel the background token refresh task, if any."""
+        if self._auth_refresh_task is not None:
+            self._auth_refresh_task.cancel()
+            self._auth_refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        """Refresh the auth token five minutes before it expires."""
+        while True:
+            remaining: float = self.token_expires_at - time.monotonic()
+            await asyncio.sleep(max(60.0, remaining - 300))
+            try:
+                await self._refresh_auth_token()
+            except Exception:
+                # Already logged; requests fall back to refreshing inline
+                pass
+
     async def _ensure_auth_token(self) -> None:
         """Ensure we have a valid authentication token."""
-        if not self.auth_token or self._is_token_expired():
-            await self._refresh_auth_token()
-
-    def _is_token_expired(self) -> bool:
-        """Check if the current auth token is expired."""
-        if not self.token_expiry:
-            return True
-        return datetime.now(timezone.utc) >= self.token_expiry
+        if self.auth_token and time.monotonic() < self.token_expires_at - 60:
+            return
+        await self._refresh_auth_token()
 
     async def _refresh_auth_token(self) -> None:
         """Refresh the authentication token."""
         try:
-            async with aiohttp.ClientSession() as session:
-                response = await session.post(
-                    f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/token",
-                    data={
-                        "grant_type": "client_credentials",
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "resource": "https://api.foundry.azure.com",
-                    },
-                )
+            session: aiohttp.ClientSession = self._get_session()
+            async with session.post(
+                f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/token",
+                data={
+                    "grant_type": "client_credentials",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "resource": "https://api.foundry.azure.com",
+                },
+            ) as response:
                 if response.status == 200:
                     data = await response.json()
                     self.auth_token = data["access_token"]
@@ -204,8 +434,9 @@ class AzureAIFoundry:
                     self.token_expiry = datetime.now(timezone.utc) + timedelta(
                         seconds=expires_in
                     )
+                    self.token_expires_at = time.monotonic() + expires_in
                 else:
                     raise Exception(f"Token refresh failed: {response.status}")
         except Exception as e:
-            logger.error(f"Error refreshing token: {str(e)}")
+            logger.error("Error refreshing token: %s", e)
             raise
@@ -0,0 +1,81 @@
+"""
+Cloud provider fallback chain for FusionAiAutoCoder.
+Tries each registered provider in order before callers fall back to local agents.
+"""
+
+from typing import Dict, Any, FrozenSet, Mapping, Optional, Protocol, Sequence
+import logging
+import asyncio
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+SUPPORTED_TASK_TYPES: FrozenSet[str] = frozenset(
+    {"code_generation", "code_optimization"}
+)
+
+
+class Provider(Protocol):
+    """A cloud backend able to generate and optimize code."""
+
+    async def process_code_generation(
+        self, prompt: str, options: Optional[Mapping[str, Any]] = None
+    ) -> Dict[str, Any]:
+        ...
+
+    async def process_code_optimization(
+        self, code: str, options: Optional[Mapping[str, Any]] = None
+    ) -> Dict[str, Any]:
+        ...
+
+
+async def call_provider(
+    provider: Provider, task_type: str, source: str, options: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Process a task with a single provider."""
+    if task_type == "code_generation":
+        return await provider.process_code_generation(prompt=source, options=options)
+    elif task_type == "code_optimization":
+        return await provider.process_code_optimization(code=source, options=options)
+    else:
+        raise ValueError(f"Unsupported task type: {task_type}")
+
+
+async def try_providers(
+    providers: Sequence[Provider],
+    task_type: str,
+    source: str,
+    options: Mapping[str, Any],
+    per_hop_timeout: float = 15,
+) -> Dict[str, Any]:
+    """Try each provider in order and return the first result without an error.
+
+    Each provider gets ``per_hop_timeout`` seconds. Timeouts, exceptions and
+    error results (HTTP 5xx/429 surface as these) move on to the next provider.
+    If every provider fails, the last error is returned. An unsupported
+    task_type raises ValueError before any provider is called.
+    """
+    if task_type not in SUPPORTED_TASK_TYPES:
+        raise ValueError(f"Unsupported task type: {task_type}")
+
+    last_error: str = "No cloud providers configured"
+    for fallback_index, provider in enumerate(providers):
+        name: str = type(provider).__name__
+        try:
+            result: Dict[str, Any] = await asyncio.wait_for(
+                call_provider(provider, task_type, source, options),
+                timeout=per_hop_timeout,
+            )
+        except asyncio.TimeoutError:
+            last_error = f"{name} timed out after {per_hop_timeout}s"
+        except Exception as e:
+            last_error = f"{name} failed: {str(e)}"
+        else:
+            if "error" not in result:
+                if fallback_index:
+                    logger.info(
+                        "Provider %s succeeded, fallback_index=%d", name, fallback_index
+                    )
+                return result
+            last_error = f"{name} failed: {result['error']}"
+        logger.warning("%s, fallback_index=%d", last_error, fallback_index)
+    return {"error": last_error}
@@ -3,25 +3,285 @@ Main module for FusionAiAutoCoder.
 Provides core functionality for generating, optimizing and analyzing code.
 """
 
-from typing import Dict, Any, List, Awaitable
+from typing import (
+    Dict,
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 import os
+import copy
+import time
+import atexit
 import logging
 import asyncio
+import threading
+import orjson
+from dataclasses import dataclass, field
 from datetime import datetime, timezone  # type: ignore
 
 from src.config.config_multi_agents import setup_agents, AgentOrchestrator
 from src.utils import setup_logging
-from src.integration.azure_foundry import AzureAIFoundry
+from src.integration.azure_foundry import AzureAIFoundry, RequestCache
+from src.integration.providers import Provider, try_providers
+
+_T = TypeVar("_T")
+_N = TypeVar("_N", int, float)
 
 # Setup logging
 logger: logging.Logger = setup_logging()
 
+# Completed workflow results, keyed by _cache_key
+prompt_cache: RequestCache = RequestCache()
+
+# Shared clients, created on first use by _get_foundry/_get_orchestrator
+_foundry: Optional[AzureAIFoundry] = None
+_orchestrator: Optional[AgentOrchestrator] = None
+
+# Workflows currently running, keyed by _cache_key, so identical
+# concurrent requests share one result
+_inflight: Dict[Tuple[str, bytes], "asyncio.Future[Dict[str, Any]]"] = {}
+
+# Code shorter than this (ignoring surrounding whitespace) is returned unchanged
+_TRIVIAL_CODE_LENGTH: int = 16
+
+# Event loop reused by the synchronous wrappers so clients and sessions
+# survive between calls; one per thread so threads run concurrently
+_local: threading.local = threading.local()
+
+# Cloud providers tried in order for each task tier; an empty tier uses the
+# shared Azure AI Foundry client
+PROVIDERS: Dict[str, List[Provider]] = {"frontier": [], "lightweight": []}
+
+
+def _get_foundry() -> AzureAIFoundry:
+    """Get the shared Azure AI Foundry client.
+
+    Construction is synchronous, so no other coroutine can interleave
+    between the check and the assignment and no lock is needed. Must be
+    called from a running loop, where it keeps the client's background
+    token refresh going; close_clients stops it.
+    """
+    global _foundry
+    if _foundry is None:
+        _foundry = AzureAIFoundry()
+    _foundry.start_background_refresh()
+    return _foundry
+
+
+async def close_clients() -> None:
+    """Close the shared Foundry client, stopping its token refresh."""
+    global _foundry
+    if _foundry is not None:
+        await _foundry.close()
+        _foundry = None
+
+
+def _get_orchestrator() -> AgentOrchestrator:
+    """Get the shared agent orchestrator."""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = setup_agents()
+    return _orchestrator
+
+
+def _text(task_data: Dict[str, Any], key: str, default: str) -> str:
+    """Read a text field from task_data, treating None as missing."""
+    value: Any = task_data.get(key)
+    return default if value is None else str(value)
+
+
+def _number(
+    task_data: Dict[str, Any], key: str, default: _N, kind: Callable[[Any], _N]
+) -> _N:
+    """Read a numeric field from task_data, converting it with kind."""
+    value: Any = task_data.get(key)
+    if value is None:
+        return default
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {key}: {value!r}") from None
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRequest:
+    """A workflow task parsed once from its task_data."""
+
+    task_type: str
+    prompt: str = ""
+    code: str = ""
+    language: str = "python"
+    temperature: float = 0.7
+    max_tokens: int = 1000
+    target: str = "performance"
+    complexity: str = "medium"
+    tier: str = "frontier"
+    timeout: float = 15
+    cloud_timeout: float = 20
+    parallel_execution: bool = False
+    # Cloud request options for this task type, built once by from_dict and
+    # passed through to providers as-is
+    options: Mapping[str, Any] = field(default_factory=dict, hash=False)
+
+    @classmethod
+    def from_dict(cls, task_type: str, task_data: Dict[str, Any]) -> "TaskRequest":
+        """Parse task_data, filling in defaults for missing keys.
+
+        Text fields given as None fall back to their defaults and other
+        values are converted with str(). Raises ValueError if a numeric
+        field can't be converted.
+        """
+        language: str = _text(task_data, "language", "python")
+        temperature: float = _number(task_data, "temperature", 0.7, float)
+        max_tokens: int = _number(task_data, "max_tokens", 1000, int)
+        target: str = _text(task_data, "target", "performance")
+        options: Dict[str, Any]
+        if task_type == "code_generation":
+            options = {
+                "language": language,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+        else:
+            options = {"target": target, "language": language}
+        return cls(
+            task_type=task_type,
+            prompt=_text(task_data, "prompt", ""),
+            code=_text(task_data, "code", ""),
+            language=language,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            target=target,
+            complexity=_text(task_data, "complexity", "medium"),
+            tier=_text(task_data, "tier", "frontier"),
+            timeout=_number(task_data, "timeout", 15.0, float),
+            cloud_timeout=_number(task_data, "cloud_timeout", 20.0, float),
+            parallel_execution=bool(task_data.get("parallel_execution", False)),
+            options=options,
+        )
+
+    @property
+    def source(self) -> str:
+        """The prompt for generation tasks, otherwise the code."""
+        return self.prompt if self.task_type == "code_generation" else self.code
+
+
+def _cache_key(
+    task_type: str, task_data: Dict[str, Any]
+) -> Optional[Tuple[str, bytes]]:
+    """Build the prompt cache key, or None if the task opts out.
+
+    Every field in task_data reaches the agents or the cloud, so the key is
+    the task type plus a canonical dump of all of task_data except no_cache.
+    Data that can't be serialized is not cached.
+    """
+    if task_data.get("no_cache", False):
+        return None
+    try:
+        data: bytes = orjson.dumps(
+            {key: value for key, value in task_data.items() if key != "no_cache"},
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    except TypeError:
+        return None
+    return task_type, data
+
+
+def _direct_response(request: TaskRequest) -> Optional[Dict[str, Any]]:
+    """Answer empty or trivial tasks without dispatching to any backend."""
+    if request.task_type == "code_generation" and not request.prompt.strip():
+        return {"error": "Empty prompt"}
+    if request.task_type == "code_optimization":
+        code: str = request.code.strip()
+        if not code:
+            return {"error": "Empty code"}
+        if len(code) < _TRIVIAL_CODE_LENGTH:
+            return {
+                "optimized_code": request.code,
+                "language": request.language,
+                "improvements": [],
+            }
+    return None
+
 
 async def hybrid_workflow(task_type: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute a hybrid workflow combining local and cloud processing, with event bus integration."""
-    azure_foundry: AzureAIFoundry = AzureAIFoundry()
+    """Execute a hybrid workflow combining local and cloud processing, with event bus integration.
+
+    Empty and trivial tasks are answered directly, repeated requests are
+    served from prompt_cache, and identical concurrent requests share one run;
+    set ``no_cache`` in task_data to bypass the cache and sharing.
+    """
+    try:
+        request: TaskRequest = TaskRequest.from_dict(task_type, task_data)
+        direct: Optional[Dict[str, Any]] = _direct_response(request)
+        cache_key: Optional[Tuple[str, bytes]] = _cache_key(task_type, task_data)
+    except Exception as e:
+        logger.error("Invalid task data: %s", e)
+        return {"error": str(e)}
+
+    if direct is not None:
+        return {**direct, "metadata": {"direct_response": True}}
+    if cache_key is None:
+        return await _execute_workflow(request, task_data)
+
+    # Cached results are copied in and out so callers can't mutate the entry
+    cached: Optional[Dict[str, Any]] = prompt_cache.get(cache_key)
+    if cached is not None:
+        hit: Dict[str, Any] = copy.deepcopy(cached)
+        hit["metadata"] = {**hit.get("metadata", {}), "cache_hit": True}
+        return hit
+
+    # Join an identical workflow already running on this loop. If its owner is
+    # cancelled, look again so the first joiner to wake takes over the run.
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    while True:
+        inflight: Optional["asyncio.Future[Dict[str, Any]]"] = _inflight.get(
+            cache_key
+        )
+        if inflight is None or inflight.get_loop() is not loop:
+            break
+        try:
+            return copy.deepcopy(await asyncio.shield(inflight))
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+
+    future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+    _inflight[cache_key] = future
+    try:
+        result: Dict[str, Any] = await _execute_workflow(request, task_data)
+        if "error" not in result:
+            prompt_cache.set(cache_key, copy.deepcopy(result))
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        # Mark it retrieved so an unjoined future doesn't log it again
+        future.exception()
+        raise
+    finally:
+        if _inflight.get(cache_key) is future:
+            del _inflight[cache_key]
+        if not future.done():
+            future.cancel()
+
+
+async def _execute_workflow(
+    request: TaskRequest, task_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Run a workflow on the cloud and/or local agents with event bus integration."""
+    task_type: str = request.task_type
+    started_ns: int = time.monotonic_ns()
     use_cloud: bool = os.environ.get("USE_CLOUD", "true").lower() == "true"
-    orchestrator: AgentOrchestrator = setup_agents()
+    orchestrator: AgentOrchestrator = _get_orchestrator()
 
     # Event bus: send workflow start event
     if hasattr(orchestrator, "send_event"):
@@ -32,19 +292,21 @@ async def hybrid_workflow(task_type: str, task_data: Dict[str, Any]) -> Dict[str
 
     try:
         result: Dict[str, Any] = {}
-        if use_cloud and task_data.get("complexity", "medium") == "high":
+        if use_cloud and request.parallel_execution:
+            result = await _race_local_and_cloud(orchestrator, request, task_data)
+        elif use_cloud and request.complexity == "high":
             try:
-                cloud_result: Dict[str, Any] = await azure_foundry.process_cloud_task(task_type, task_data)
+                cloud_result: Dict[str, Any] = await _process_cloud_task(request)
                 if "error" not in cloud_result:
                     result = cloud_result
                 else:
-                    result = orchestrator.create_workflow(task_type, task_data)
+                    result = await _run_local(orchestrator, task_type, task_data)
             except Exception as cloud_error:
-                logger.error(f"Error in cloud processing: {str(cloud_error)}")
+                logger.error("Error in cloud processing: %s", cloud_error)
                 logger.warning("Falling back to local agent processing")
-                result = orchestrator.create_workflow(task_type, task_data)
+                result = await _run_local(orchestrator, task_type, task_data)
         else:
-            result = orchestrator.create_workflow(task_type, task_data)
+            result = await _run_local(orchestrator, task_type, task_data)
 
         # Event bus: send workflow end event
         if hasattr(orchestrator, "send_event"):
@@ -52,65 +314,150 @@ async def hybrid_workflow(task_type: str, task_data: Dict[str, Any]) -> Dict[str
                 topic="agent.workflow.events",
                 message={"event": "workflow_end", "task_type": task_type, "result": result, "timestamp": datetime.now(timezone.utc).isoformat()}
             )
+        logger.debug(
+            "Hybrid workflow for %s finished in %.3fs",
+            task_type,
+            (time.monotonic_ns() - started_ns) / 1e9,
+        )
         return result
     except Exception as e:
-        logger.error(f"Error in hybrid workflow: {str(e)}")
+        logger.error("Error in hybrid workflow: %s", e)
         return {"error": str(e)}
 
 
-async def batch_process(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Process multiple tasks in parallel."""
-    results: List[Dict[str, Any]] = []
-    tasks_futures: List[Awaitable[Dict[str, Any]]] = [
-        hybrid_workflow(task["type"], task["data"]) for task in tasks
-    ]
+async def _run_local(
+    orchestrator: AgentOrchestrator, task_type: str, task_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Run the blocking local agent workflow on the default thread pool."""
+    return await asyncio.to_thread(orchestrator.create_workflow, task_type, task_data)
+
 
-    completed_tasks: List[Dict[str, Any]] = await asyncio.gather(
-        *tasks_futures, return_exceptions=True
+async def _race_local_and_cloud(
+    orchestrator: AgentOrchestrator,
+    request: TaskRequest,
+    task_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Run local agents and the cloud concurrently; return the first usable result.
+
+    A result is usable if it has no "error" key. The slower task is cancelled
+    once a usable result arrives; if neither succeeds the local result wins.
+    """
+    local_task: "asyncio.Task[Dict[str, Any]]" = asyncio.create_task(
+        _run_local(orchestrator, request.task_type, task_data)
     )
+    cloud_task: "asyncio.Task[Dict[str, Any]]" = asyncio.create_task(
+        _process_cloud_task(request)
+    )
+    pending: Set["asyncio.Task[Dict[str, Any]]"] = {local_task, cloud_task}
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            if task.exception() is None and "error" not in task.result():
+                for other in pending:
+                    other.cancel()
+                return task.result()
 
-    for task_result in completed_tasks:
-        if isinstance(task_result, Exception):
-            results.append({"error": str(task_result)})
-        else:
-            results.append(task_result)
+    cloud_error: Optional[BaseException] = cloud_task.exception()
+    if cloud_error is not None:
+        logger.error("Error in cloud processing: %s", cloud_error)
+    return local_task.result()
+
+
+async def batch_process_stream(
+    tasks: List[Dict[str, Any]], concurrency: int = 8
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """Process multiple tasks in parallel, yielding results as they finish.
+
+    Yields ``(index, result)`` pairs in completion order, where ``index`` is the
+    task's position in ``tasks``. At most ``concurrency`` workflows run at once
+    so callers can stay within Azure AI Foundry rate limits.
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(index: int, task: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        if "type" not in task:
+            return index, {"error": "Missing task type"}
+        try:
+            async with semaphore:
+                return index, await hybrid_workflow(task["type"], task.get("data", {}))
+        except Exception as e:
+            return index, {"error": str(e)}
+
+    pending: List["asyncio.Task[Tuple[int, Dict[str, Any]]]"] = [
+        asyncio.create_task(_bounded(index, task)) for index, task in enumerate(tasks)
+    ]
+    try:
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+    finally:
+        # Stop outstanding workflows if the consumer stops iterating early
+        for task in pending:
+            task.cancel()
+
+
+async def batch_process(
+    tasks: List[Dict[str, Any]], concurrency: int = 8
+) -> List[Dict[str, Any]]:
+    """Process multiple tasks in parallel.
 
+    Results keep the order of ``tasks``; see batch_process_stream to handle
+    them as they complete.
+    """
+    results: List[Dict[str, Any]] = [{} for _ in tasks]
+    async for index, result in batch_process_stream(tasks, concurrency):
+        results[index] = result
     return results
 
 
+def _run_sync(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a coroutine to completion on this thread's event loop.
+
+    Like asyncio.run, raises RuntimeError if called from a running loop.
+    """
+    runner: Optional[asyncio.Runner] = getattr(_local, "runner", None)
+    if runner is None:
+        runner = asyncio.Runner()
+        atexit.register(runner.close)
+        _local.runner = runner
+    return runner.run(coro)
+
+
 def run_workflow(task_type: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
     """Synchronous wrapper for hybrid_workflow."""
-    return asyncio.run(hybrid_workflow(task_type, task_data))
+    return _run_sync(hybrid_workflow(task_type, task_data))
 
 
 def run_batch_process(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Synchronous wrapper for batch_process."""
-    return asyncio.run(batch_process(tasks))
+    return _run_sync(batch_process(tasks))
 
 
-async def _process_cloud_task(
-    azure_foundry: AzureAIFoundry, task_type: str, task_data: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Process a task using Azure AI Foundry."""
-    if task_type == "code_generation":
-        return await azure_foundry.process_code_generation(
-            prompt=task_data.get("prompt", ""),
-            options={
-                "language": task_data.get("language", "python"),
-                "temperature": task_data.get("temperature", 0.7),
-                "max_tokens": task_data.get("max_tokens", 1000),
-            },
-        )
-    elif task_type == "code_optimization":
-        return await azure_foundry.process_code_optimization(
-            code=task_data.get("code", ""),
-            options={
-                "target": task_data.get("target", "performance"),
-                "language": task_data.get("language", "python"),
-            },
+def _get_providers(tier: str) -> List[Provider]:
+    """Get the cloud provider chain for a task tier."""
+    return PROVIDERS.get(tier) or [_get_foundry()]
+
+
+async def _process_cloud_task(request: TaskRequest) -> Dict[str, Any]:
+    """Process a task with the cloud provider chain for its tier.
+
+    Each provider gets ``timeout`` seconds and the whole chain gets
+    ``cloud_timeout`` seconds, after which an error result is returned.
+    """
+    try:
+        return await asyncio.wait_for(
+            try_providers(
+                _get_providers(request.tier),
+                request.task_type,
+                request.source,
+                request.options,
+                per_hop_timeout=request.timeout,
+            ),
+            timeout=request.cloud_timeout,
         )
-    else:
-        raise ValueError(f"Unsupported task type: {task_type}")
+    except asyncio.TimeoutError:
+        return {"error": f"Cloud providers timed out after {request.cloud_timeout}s"}
 
 
 if __name__ == "__main__":
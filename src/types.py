@@ -1,12 +1,15 @@
 """Type definitions for FusionAiAutoCoder."""
 
-from typing import TypeVar, Dict, Any, Union, List, Optional, TypedDict
+from typing import TYPE_CHECKING, TypeVar, Dict, Any, Union, List, Optional
+from dataclasses import dataclass
 from enum import Enum
-import torch  # type: ignore
-import numpy as np
 from datetime import datetime
 import os
 
+if TYPE_CHECKING:
+    import torch  # type: ignore
+    import numpy as np
+
 
 class TaskType(Enum):
     """Enumeration of possible task types."""
@@ -33,7 +36,8 @@ class OptimizationTarget(Enum):
     READABILITY = "readability"
 
 
-class TorchVersionInfo(TypedDict):
+@dataclass(slots=True)
+class TorchVersionInfo:
     """Data class for PyTorch version information."""
 
     torch_version: str
@@ -43,7 +47,8 @@ class TorchVersionInfo(TypedDict):
     device_info: Dict[str, Union[str, int, bool]]
 
 
-class TaskResult(TypedDict):
+@dataclass(frozen=True, slots=True)
+class TaskResult:
     """Data class for task execution results."""
 
     task_id: str
@@ -51,7 +56,7 @@ class TaskResult(TypedDict):
     result: Dict[str, Any]
     execution_time: float
     timestamp: datetime
-    error: Optional[str]
+    error: Optional[str] = None
 
 
 class TorchInstallError(Exception):
@@ -71,7 +76,8 @@ class ConfigurationError(Exception):
 
 
 # Type aliases
-TensorOrArray = Union[torch.Tensor, np.ndarray[Any, Any]]  # Represents a tensor or numpy array
+# Represents a tensor or numpy array; forward refs keep torch/numpy off import
+TensorOrArray = Union["torch.Tensor", "np.ndarray[Any, Any]"]
 BatchData = List[Dict[str, Any]]
 ModelOutput = TypeVar("ModelOutput")  # Generic type for model outputs
 ConfigDict = Dict[str, Any]
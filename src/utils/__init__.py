@@ -0,0 +1,167 @@
+"""Utility functions for FusionAiAutoCoder."""
+
+from typing import Dict, Any, Optional, Tuple, Union
+import os
+import json
+import orjson
+from functools import lru_cache
+from pathlib import Path
+from datetime import datetime, timezone  # type: ignore
+from logging import Logger  # type: ignore
+import logging  # type: ignore
+
+
+_LOG_LEVELS: Dict[str, int] = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+def setup_logging(
+    level: Optional[str] = None, log_file: Optional[str] = None
+) -> Logger:
+    """Configure logging for the application.
+
+    Safe to call repeatedly: each handler is added once, so records are not
+    emitted several times, and they do not propagate to the root logger.
+    Unknown level names fall back to INFO.
+    """
+    level_name: str = (level or os.environ.get("LOG_LEVEL", "INFO")).upper()
+    log_level: int = _LOG_LEVELS.get(level_name, logging.INFO)
+
+    logger: Logger = logging.getLogger("fusion_ai")
+    logger.setLevel(log_level)
+    # Records are handled here only, not formatted again by root handlers
+    logger.propagate = False
+
+    formatter: logging.Formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    # Console handler
+    if not any(type(h) is logging.StreamHandler for h in logger.handlers):
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+
+    # File handler if specified
+    if log_file:
+        log_path: str = os.path.abspath(log_file)
+        if not any(
+            isinstance(h, logging.FileHandler) and h.baseFilename == log_path
+            for h in logger.handlers
+        ):
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+
+    return logger
+
+
+@lru_cache(maxsize=1)
+def is_gpu_available() -> bool:
+    """Check if GPU acceleration is available.
+
+    The result is cached for the life of the process; call
+    invalidate_capabilities() after changing ENABLE_GPU_ACCELERATION or devices.
+    """
+    if os.environ.get("ENABLE_GPU_ACCELERATION", "").lower() == "false":
+        return False
+    import torch  # type: ignore
+
+    return torch.cuda.is_available()
+
+
+@lru_cache(maxsize=1)
+def _gpu_devices() -> Tuple[Dict[str, Any], ...]:
+    """Get the static properties of each GPU, cached like is_gpu_available()."""
+    if not is_gpu_available():
+        return ()
+    import torch  # type: ignore
+
+    return tuple(
+        {
+            "name": torch.cuda.get_device_name(i),
+            "capability": torch.cuda.get_device_capability(i),
+            "total_memory": torch.cuda.get_device_properties(i).total_memory,
+        }
+        for i in range(torch.cuda.device_count())
+    )
+
+
+def get_gpu_info() -> Dict[str, Any]:
+    """Get detailed GPU information if available.
+
+    Device properties are cached; only the allocated memory is read per call.
+    """
+    devices: Tuple[Dict[str, Any], ...] = _gpu_devices()
+    info: Dict[str, Any] = {
+        "available": is_gpu_available(),
+        "count": len(devices),
+        "devices": [],
+    }
+
+    if devices:
+        import torch  # type: ignore
+
+        for i, device in enumerate(devices):
+            device_info: Dict[str, Any] = {
+                **device,
+                "free_memory": torch.cuda.memory_allocated(i),
+            }
+            info["devices"].append(device_info)
+
+    return info
+
+
+@lru_cache(maxsize=1)
+def get_version_info() -> Dict[str, str]:
+    """Get version information for the application.
+
+    The result is cached, so callers must not mutate the returned dict.
+    """
+    version_file: Path = Path(__file__).parents[2] / "version.json"
+    version_info: Dict[str, str] = {
+        "version": "0.1.0",
+        "build_date": datetime.now(timezone.utc).isoformat(),
+    }
+
+    if version_file.exists():
+        with open(version_file) as f:
+            version_info.update(json.load(f))
+
+    return version_info
+
+
+def invalidate_capabilities() -> None:
+    """Clear the cached GPU availability, devices and version information."""
+    is_gpu_available.cache_clear()
+    _gpu_devices.cache_clear()
+    get_version_info.cache_clear()
+
+
+def read_config(config_path: Union[str, Path]) -> Dict[str, Any]:
+    """Read configuration from a JSON file."""
+    path: str = os.fspath(config_path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Configuration file not found: {path}")
+
+    with open(path, "rb") as f:
+        config: Dict[str, Any] = orjson.loads(f.read())
+
+    return config
+
+
+def save_config(config: Dict[str, Any], config_path: Union[str, Path]) -> None:
+    """Save configuration to a JSON file."""
+    config_path = Path(config_path)
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+
+    options: int = (
+        orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+    with open(config_path, "wb") as f:
+        f.write(orjson.dumps(config, option=options))
@@ -1,9 +1,9 @@
 """Type checking utilities and runtime verification."""
 
-from typing import Any, Callable, Optional, TypeVar, Type, cast
-from functools import wraps
+from typing import Any, Callable, Optional, Tuple, TypeVar, Type, get_type_hints
+from functools import lru_cache
 import logging
-from typeguard import TypeCheckError  # type: ignore
+from typeguard import TypeCheckError, typechecked  # type: ignore
 
 T = TypeVar("T")
 F = TypeVar("F", bound=Callable[..., Any])
@@ -13,24 +13,22 @@ logger = logging.getLogger(__name__)
 
 def type_error_handler(error: TypeCheckError, stack: Optional[Any] = None) -> None:
     """Handle type checking errors."""
-    logger.error(f"Type check failed: {error}")
+    logger.error("Type check failed: %s", error)
     if stack:
-        logger.debug(f"Stack trace: {stack}")
+        logger.debug("Stack trace: %s", stack)
     raise error
 
 
-@typechecked  # type: ignore
 def strict_types(func: F) -> F:
-    """Decorator for strict type checking."""
+    """Decorator for strict type checking.
 
-    @wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        return func(*args, **kwargs)
+    Arguments and return values are checked against func's annotations on
+    every call, and a mismatch raises typeguard.TypeCheckError. typeguard
+    instruments func directly, so there is no extra wrapper frame.
+    """
+    return typechecked(func)
 
-    return cast(F, wrapper)
 
-
-@typechecked  # type: ignore
 def ensure_type(value: Any, expected_type: Type[T]) -> T:
     """Ensure value matches expected type."""
     if not isinstance(value, expected_type):
@@ -40,24 +38,26 @@ def ensure_type(value: Any, expected_type: Type[T]) -> T:
     return value
 
 
-@typechecked  # type: ignore
 def runtime_checkable(cls: Type[T]) -> Type[T]:
     """Class decorator for runtime type checking."""
     cls.__post_init__ = lambda self: validate_types(self)
     return cls
 
 
-@typechecked  # type: ignore
+@lru_cache(maxsize=None)
+def _get_type_hints(cls: type) -> Tuple[Tuple[str, Any], ...]:
+    """Resolve a class's type hints once and cache them per class."""
+    return tuple(get_type_hints(cls).items())
+
+
 def validate_types(obj: Any) -> None:
     """Validate type annotations at runtime."""
-    hints = getattr(obj.__class__, "__annotations__", {})
-    for name, expected_type in hints.items():
+    for name, expected_type in _get_type_hints(obj.__class__):
         if hasattr(obj, name):
             value = getattr(obj, name)
             ensure_type(value, expected_type)
 
 
-@typechecked  # type: ignore
 def coerce_type(value: Any, target_type: Type[T]) -> T:
     """Attempt to coerce value to target type."""
     if isinstance(value, target_type):
@@ -67,4 +67,4 @@ def coerce_type(value: Any, target_type: Type[T]) -> T:
     except (ValueError, TypeError) as e:
         raise TypeError(
             f"Cannot coerce {type(value).__name__} to {target_type.__name__}: {e}"
-        )
+        ) from e
@@ -1,57 +1,92 @@
 """Input validation and type checking utilities."""
 
-from typing import Dict, Any, List, Optional, Type, TypeVar, Union  # type: ignore
+from typing import (  # type: ignore
+    Dict,
+    Any,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+)
+from functools import lru_cache
 from pathlib import Path
-import re
+import string
+import sys
 
 from src.config.constants import SUPPORTED_LANGUAGES, TaskPriority, TaskStatus
 from src.types import ConfigurationError
 
 T = TypeVar("T")
 
+# Characters allowed on each side of the "@" in validate_email
+_EMAIL_LOCAL_CHARS: FrozenSet[str] = frozenset(
+    string.ascii_letters + string.digits + "._%+-"
+)
+_EMAIL_DOMAIN_CHARS: FrozenSet[str] = frozenset(
+    string.ascii_letters + string.digits + ".-"
+)
 
+_SUPPORTED_LANGUAGES: FrozenSet[str] = frozenset(
+    language.lower() for language in SUPPORTED_LANGUAGES
+)
+_PRIORITY_BY_VALUE: Dict[str, TaskPriority] = {p.value: p for p in TaskPriority}
+_STATUS_BY_VALUE: Dict[str, TaskStatus] = {s.value: s for s in TaskStatus}
+
+
+@lru_cache(maxsize=256, typed=True)
 def validate_language(language: str) -> str:
     """Validate programming language is supported."""
-    if language.lower() not in SUPPORTED_LANGUAGES:
+    # Interned so every spelling of a language returns the same key object
+    lowered: str = sys.intern(language.lower())
+    if lowered not in _SUPPORTED_LANGUAGES:
         raise ConfigurationError(
             f"Unsupported language: {language}. Supported languages: {SUPPORTED_LANGUAGES}"
         )
-    return language.lower()
+    return lowered
 
 
+@lru_cache(maxsize=256, typed=True)
 def validate_priority(priority: str) -> TaskPriority:
     """Validate task priority."""
-    try:
-        return TaskPriority(priority.lower())
-    except ValueError:
+    value: Optional[TaskPriority] = _PRIORITY_BY_VALUE.get(priority.lower())
+    if value is None:
         raise ConfigurationError(
-            f"Invalid priority: {priority}. Valid priorities: {[p.value for p in TaskPriority]}"
+            f"Invalid priority: {priority}. Valid priorities: {list(_PRIORITY_BY_VALUE)}"
         )
+    return value
 
 
+@lru_cache(maxsize=256, typed=True)
 def validate_status(status: str) -> TaskStatus:
     """Validate task status."""
-    try:
-        return TaskStatus(status.lower())
-    except ValueError:
+    value: Optional[TaskStatus] = _STATUS_BY_VALUE.get(status.lower())
+    if value is None:
         raise ConfigurationError(
-            f"Invalid status: {status}. Valid statuses: {[s.value for s in TaskStatus]}"
+            f"Invalid status: {status}. Valid statuses: {list(_STATUS_BY_VALUE)}"
         )
+    return value
 
 
 def validate_file_path(path: Union[str, Path]) -> Path:
-    """Validate file path."""
-    try:
-        path = Path(path)
-        if not path.parent.exists():
-            raise ConfigurationError(f"Parent directory does not exist: {path.parent}")
-        return path
-    except Exception as e:
-        raise ConfigurationError(f"Invalid file path: {path}") from e
+    """Validate file path.
+
+    The parent is stat'ed on every call rather than cached, so a directory
+    removed or a cwd changed between calls is always seen.
+    """
+    path = Path(path)
+    if not path.parent.exists():
+        raise ConfigurationError(f"Parent directory does not exist: {path.parent}")
+    return path
 
 
 def validate_type(value: Any, expected_type: Type[T]) -> T:
     """Validate value is of expected type."""
+    # Exact matches are the common case and skip the isinstance subclass walk
+    if type(value) is expected_type:
+        return value
     if not isinstance(value, expected_type):
         raise ConfigurationError(
             f"Invalid type: {type(value)}. Expected: {expected_type}"
@@ -59,24 +94,43 @@ def validate_type(value: Any, expected_type: Type[T]) -> T:
     return value
 
 
+@lru_cache(maxsize=256, typed=True)
 def validate_email(email: str) -> str:
-    """Validate email address format."""
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    if not re.match(pattern, email):
+    """Validate email address format.
+
+    Accepts local@domain.tld where tld is at least two ASCII letters, checked in
+    a single left-to-right pass with no regex backtracking.
+    """
+    local, at, domain = email.rpartition("@")
+    name, dot, tld = domain.rpartition(".")
+    if not (
+        at
+        and local
+        and name
+        and dot
+        and len(tld) >= 2
+        and tld.isascii()
+        and tld.isalpha()
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_DOMAIN_CHARS.issuperset(name)
+    ):
         raise ConfigurationError(f"Invalid email format: {email}")
     return email
 
 
+@lru_cache(maxsize=256, typed=True)
 def validate_port(port: int) -> int:
     """Validate port number."""
-    if not 0 <= port <= 65535:
+    if port < 0 or port > 65535:
         raise ConfigurationError(f"Invalid port number: {port}")
     return port
 
 
 def validate_config(config: Dict[str, Any], required_keys: List[str]) -> Dict[str, Any]:
     """Validate configuration dictionary has required keys."""
-    missing_keys = [key for key in required_keys if key not in config]
-    if missing_keys:
+    missing: Set[str] = set(required_keys).difference(config)
+    if missing:
+        # Report in the caller's order; only reached on the failure path
+        missing_keys = [key for key in required_keys if key in missing]
         raise ConfigurationError(f"Missing required configuration keys: {missing_keys}")
     return config
@@ -1,44 +1,54 @@
 """Shared test configuration and fixtures."""
 
-from typing import AsyncGenerator  # Only keep necessary imports
+from typing import Any, Mapping  # Only keep necessary imports
+from types import MappingProxyType
 import pytest  # type: ignore
 from pathlib import Path
 from datetime import datetime, timezone
 
-from src.types import ConfigDict, TaskResult
+from src.types import TaskResult
 from src.config.config_multi_agents import AgentOrchestrator
 
+_DATA_DIR: Path = Path(__file__).resolve().parent / "data"
 
-@pytest.fixture
-def test_config() -> ConfigDict:
-    """Provide test configuration."""
-    return {
-        "api": {"version": "1.0.0", "port": 8080, "host": "0.0.0.0"},
-        "logging": {"level": "DEBUG", "file": "tests.log"},
-        "agents": {"max_concurrent": 4, "timeout_seconds": 30},
+# Shared, read-only payloads built once per session
+_TEST_CONFIG: Mapping[str, Any] = MappingProxyType(
+    {
+        "api": MappingProxyType(
+            {"version": "1.0.0", "port": 8080, "host": "0.0.0.0"}
+        ),
+        "logging": MappingProxyType({"level": "DEBUG", "file": "tests.log"}),
+        "agents": MappingProxyType({"max_concurrent": 4, "timeout_seconds": 30}),
     }
+)
+_SAMPLE_TASK_RESULT: TaskResult = TaskResult(
+    task_id="test-123",
+    status="completed",
+    result={"code": "def test(): pass"},
+    execution_time=1.23,
+    timestamp=datetime.now(timezone.utc),
+)
+
+
+@pytest.fixture(scope="session")
+def test_config() -> Mapping[str, Any]:
+    """Provide test configuration."""
+    return _TEST_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_task_result() -> TaskResult:
     """Provide a sample task result."""
-    return TaskResult(
-        task_id="test-123",
-        status="completed",
-        result={"code": "def test(): pass"},
-        execution_time=1.23,
-        timestamp=datetime.now(timezone.utc),
-    )
+    return _SAMPLE_TASK_RESULT
 
 
-@pytest.fixture
-async def agent_orchestrator() -> AsyncGenerator[AgentOrchestrator, None]:
-    """Provide a configured agent orchestrator."""
-    orchestrator = AgentOrchestrator({"max_agents": 2, "timeout_seconds": 10})
-    yield orchestrator
+@pytest.fixture(scope="session")
+def agent_orchestrator() -> AgentOrchestrator:
+    """Provide a configured agent orchestrator, built once per session."""
+    return AgentOrchestrator({"max_agents": 2, "timeout_seconds": 10})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_data_dir() -> Path:
     """Provide path to test data directory."""
-    return Path(__file__).parent / "data"
+    return _DATA_DIR
@@ -1,6 +1,6 @@
 """Test API functionality."""
 
-from typing import Dict, Any, Generator
+from typing import Dict, Any, Callable, Generator
 import pytest  # type: ignore
 from fastapi.testclient import TestClient  # type: ignore
 from unittest.mock import patch, MagicMock, AsyncMock  # type: ignore
@@ -8,45 +8,59 @@ from unittest.mock import patch, MagicMock, AsyncMock  # type: ignore
 from src.api import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client() -> TestClient:
-    """Create a test client."""
+    """Create a test client shared by the whole session."""
     return TestClient(app)
 
 
+def _code_generation_response(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the mocked code generation result."""
+    return {
+        "code": "def validate_email(email: str) -> bool:\n    # Implementation\n    pass",
+        "language": task_data.get("language", "python"),
+        "confidence": 0.85,
+        "metadata": {
+            "execution_time": 1.23,
+            "gpu_used": task_data.get("use_gpu", False),
+        },
+    }
+
+
+def _code_optimization_response(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the mocked code optimization result."""
+    return {
+        "optimized_code": "def optimized_function() -> None:\n    pass",
+        "language": task_data.get("language", "python"),
+        "improvements": [
+            "Algorithm optimization",
+            "Memory usage reduction",
+        ],
+        "estimated_speedup": "75%",
+        "metadata": {"execution_time": 2.34, "gpu_used": False},
+    }
+
+
+def _unknown_task_response(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the mocked result for an unsupported task type."""
+    return {"error": "Unknown task type"}
+
+
+_MOCK_RESPONSES: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "code_generation": _code_generation_response,
+    "code_optimization": _code_optimization_response,
+}
+
+
+async def _mock_workflow(task_type: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Stand in for hybrid_workflow, dispatching on task type."""
+    return _MOCK_RESPONSES.get(task_type, _unknown_task_response)(task_data)
+
+
 @pytest.fixture
 def mock_hybrid_workflow() -> Generator[MagicMock, None, None]:
     """Fixture to mock the hybrid_workflow function."""
-    with patch("src.main.hybrid_workflow") as mock:
-
-        async def mock_workflow(
-            task_type: str, task_data: Dict[str, Any]
-        ) -> Dict[str, Any]:
-            if task_type == "code_generation":
-                return {
-                    "code": "def validate_email(email: str) -> bool:\n    # Implementation\n    pass",
-                    "language": task_data.get("language", "python"),
-                    "confidence": 0.85,
-                    "metadata": {
-                        "execution_time": 1.23,
-                        "gpu_used": task_data.get("use_gpu", False),
-                    },
-                }
-            elif task_type == "code_optimization":
-                return {
-                    "optimized_code": "def optimized_function() -> None:\n    pass",
-                    "language": task_data.get("language", "python"),
-                    "improvements": [
-                        "Algorithm optimization",
-                        "Memory usage reduction",
-                    ],
-                    "estimated_speedup": "75%",
-                    "metadata": {"execution_time": 2.34, "gpu_used": False},
-                }
-            else:
-                return {"error": "Unknown task type"}
-
-        mock.side_effect = mock_workflow
+    with patch("src.main.hybrid_workflow", side_effect=_mock_workflow) as mock:
         yield mock
 
 
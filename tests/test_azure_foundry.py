@@ -0,0 +1,207 @@
+"""Test Azure AI Foundry integration."""
+
+from typing import Dict, Any, List
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+import pytest  # type: ignore
+
+from src.config.constants import CACHE_TTL
+from src.integration.azure_foundry import (
+    AzureAIFoundry,
+    RequestCache,
+    _GENERATION_OPTION_DEFAULTS,
+    _select_options,
+)
+import src.main
+from src.main import TaskRequest
+
+
+def test_request_cache_lru_eviction() -> None:
+    """Test least recently used entries are evicted first."""
+    cache = RequestCache(max_size=2, ttl=60, shards=1)
+    cache.set("a", {"value": 1})
+    cache.set("b", {"value": 2})
+    assert cache.get("a") == {"value": 1}
+
+    cache.set("c", {"value": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1}
+    assert cache.get("c") == {"value": 3}
+
+    stats: Dict[str, Any] = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_request_cache_expiry() -> None:
+    """Test expired entries are treated as misses."""
+    cache = RequestCache(max_size=4, ttl=-1, shards=1)
+    cache.set("a", {"value": 1})
+    assert cache.get("a") is None
+
+    stats: Dict[str, Any] = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert stats["misses"] == 1
+
+
+def test_request_cache_concurrent_set() -> None:
+    """Test concurrent writers never exceed max_size or corrupt order."""
+    cache = RequestCache(max_size=8, ttl=60, shards=4)
+
+    def writer(offset: int) -> None:
+        for i in range(500):
+            cache.set(f"{offset}-{i}", {"value": i})
+
+    threads: List[threading.Thread] = [
+        threading.Thread(target=writer, args=(n,)) for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats: Dict[str, Any] = cache.get_stats()
+    assert stats["size"] == 8
+    assert stats["insertions"] == 2000
+    assert stats["evictions"] == 2000 - 8
+
+
+def test_request_cache_shards() -> None:
+    """Test sharded capacity and that shard counts must be powers of two."""
+    with pytest.raises(ValueError):
+        RequestCache(shards=3)
+
+    cache = RequestCache(max_size=64, ttl=60, shards=8)
+    for i in range(256):
+        cache.set(f"key-{i}", {"value": i})
+
+    stats: Dict[str, Any] = cache.get_stats()
+    assert stats["size"] == 64
+    assert stats["insertions"] == 256
+    assert stats["evictions"] == 256 - 64
+
+
+@pytest.mark.asyncio
+async def test_process_cache_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a cached response is not served once its TTL has passed."""
+    foundry = AzureAIFoundry()
+    foundry.use_mock = False
+    foundry.cache_enabled = True
+    foundry.auth_token = "token"
+    foundry.token_expires_at = float("inf")
+
+    response = MagicMock(status=200)
+    response.read = AsyncMock(return_value=b'{"code": "pass"}')
+    post = MagicMock()
+    post.return_value.__aenter__ = AsyncMock(return_value=response)
+    post.return_value.__aexit__ = AsyncMock(return_value=None)
+    monkeypatch.setattr(foundry, "_get_session", lambda: MagicMock(post=post))
+
+    assert await foundry.process_code_generation("prompt") == {"code": "pass"}
+    assert await foundry.process_code_generation("prompt") == {"code": "pass"}
+    assert post.call_count == 1
+
+    now: float = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + CACHE_TTL + 1)
+    assert await foundry.process_code_generation("prompt") == {"code": "pass"}
+    assert post.call_count == 2
+
+    foundry.request_cache.clear()
+    assert await foundry.process_code_generation("prompt") == {"code": "pass"}
+    assert post.call_count == 3
+
+
+def test_session_per_event_loop() -> None:
+    """Test each loop gets its own session and close() releases all of them."""
+    foundry = AzureAIFoundry()
+
+    async def get_session() -> Any:
+        return foundry._get_session()
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+    assert second is not first
+    assert first.closed
+
+    async def reuse_and_close() -> None:
+        session = foundry._get_session()
+        assert foundry._get_session() is session
+        await foundry.close()
+        assert session.closed
+
+    asyncio.run(reuse_and_close())
+    assert second.closed
+    assert not foundry._sessions
+
+
+def test_select_options_passthrough() -> None:
+    """Test exact API option dicts are reused and supersets are trimmed."""
+    request = TaskRequest.from_dict("code_generation", {"prompt": "p"})
+    assert _select_options(request.options, _GENERATION_OPTION_DEFAULTS) is (
+        request.options
+    )
+
+    selected = _select_options(
+        {"language": "rust", "prompt": "p"}, _GENERATION_OPTION_DEFAULTS
+    )
+    assert selected == {"language": "rust", "temperature": 0.7, "max_tokens": 1000}
+
+
+@pytest.mark.asyncio
+async def test_refresh_loop_schedules_ahead_of_expiry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the refresh loop wakes five minutes early and survives failures."""
+    foundry = AzureAIFoundry()
+    foundry.token_expires_at = time.monotonic() + 3600
+    sleep = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    outcomes: List[Any] = [Exception("login failed"), 100, asyncio.CancelledError]
+
+    async def refresh() -> None:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, int):
+            foundry.token_expires_at = time.monotonic() + outcome
+        else:
+            raise outcome
+
+    monkeypatch.setattr(foundry, "_refresh_auth_token", refresh)
+    with pytest.raises(asyncio.CancelledError):
+        await foundry._refresh_loop()
+
+    delays: List[float] = [call.args[0] for call in sleep.await_args_list]
+    assert len(delays) == 3
+    # A failed refresh retries on the old schedule; a short token waits 60s
+    assert 3290 < delays[0] <= 3300
+    assert 3290 < delays[1] <= 3300
+    assert delays[2] == 60.0
+
+
+@pytest.mark.asyncio
+async def test_shared_foundry_refreshes_in_background(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the shared client starts its token refresh and close_clients stops it."""
+
+    async def idle(self: AzureAIFoundry) -> None:
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(src.main, "_foundry", None)
+    monkeypatch.setattr(AzureAIFoundry, "_refresh_loop", idle)
+    monkeypatch.setenv("USE_MOCK_FOUNDRY", "false")
+    for name in ("AZURE_TENANT_ID", "AZURE_CLIENT_ID", "AZURE_CLIENT_SECRET"):
+        monkeypatch.setenv(name, "test")
+
+    foundry = src.main._get_foundry()
+    task = foundry._auth_refresh_task
+    assert task is not None and not task.done()
+    assert src.main._get_foundry()._auth_refresh_task is task
+
+    await src.main.close_clients()
+    assert foundry._auth_refresh_task is None
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert src.main._foundry is None
+
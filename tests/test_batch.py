@@ -1,10 +1,11 @@
 """Test batch processing functionality."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import asyncio
 import pytest  # type: ignore
 from unittest.mock import patch  # type: ignore
 
-from src.main import run_batch_process, batch_process
+from src.main import run_batch_process, batch_process, batch_process_stream
 from src.types import TaskType, BatchData
 
 
@@ -52,3 +53,52 @@ async def test_batch_process_error_handling() -> None:
     results: List[Dict[str, Any]] = await batch_process(invalid_tasks)
     assert len(results) == 1
     assert "error" in results[0]
+
+
+@pytest.mark.asyncio
+async def test_batch_process_concurrency_limit() -> None:
+    """Test batch processing caps concurrent workflows and keeps order."""
+    running: int = 0
+    peak: int = 0
+
+    async def fake_workflow(
+        task_type: str, task_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"index": task_data["index"]}
+
+    tasks: BatchData = [
+        {"type": TaskType.CODE_GENERATION.value, "data": {"index": i}}
+        for i in range(10)
+    ]
+    with patch("src.main.hybrid_workflow", side_effect=fake_workflow):
+        results: List[Dict[str, Any]] = await batch_process(tasks, concurrency=3)
+
+    assert peak == 3
+    assert [result["index"] for result in results] == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_batch_process_stream_completion_order() -> None:
+    """Test streamed results arrive as they finish, tagged with their index."""
+
+    async def fake_workflow(
+        task_type: str, task_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        await asyncio.sleep(task_data["delay"])
+        return {"delay": task_data["delay"]}
+
+    tasks: BatchData = [
+        {"type": TaskType.CODE_GENERATION.value, "data": {"delay": delay}}
+        for delay in (0.03, 0.01, 0.02)
+    ]
+    with patch("src.main.hybrid_workflow", side_effect=fake_workflow):
+        streamed: List[Tuple[int, Dict[str, Any]]] = [
+            item async for item in batch_process_stream(tasks)
+        ]
+
+    assert [index for index, _ in streamed] == [1, 2, 0]
@@ -2,69 +2,105 @@
 Unit tests for the main module.
 """
 
-from typing import Dict, Any, Generator
+from typing import Dict, Any, Generator, Mapping
+from types import MappingProxyType
+import time
+import asyncio
+import threading
 import pytest  # type: ignore
-from unittest.mock import patch, MagicMock  # type: ignore
+from unittest.mock import patch, MagicMock, AsyncMock  # type: ignore
 
-from src.main import run_workflow
+import src.main
+from src.main import hybrid_workflow, run_batch_process, run_workflow, prompt_cache
 
 # Test data
-TEST_TASK_CODE_GENERATION = {
-    "prompt": "Create a function to validate email addresses",
-    "language": "python",
-    "complexity": "low",
-}
+# Read-only so no test can leak changes into another; pass dict(...) copies
+TEST_TASK_CODE_GENERATION: Mapping[str, Any] = MappingProxyType(
+    {
+        "prompt": "Create a function to validate email addresses",
+        "language": "python",
+        "complexity": "low",
+    }
+)
+
+TEST_TASK_CODE_OPTIMIZATION: Mapping[str, Any] = MappingProxyType(
+    {
+        "code": "def factorial(n):\n    if n == 0: return 1\n    return n * factorial(n-1)",
+        "optimization_target": "performance",
+        "language": "python",
+    }
+)
 
-TEST_TASK_CODE_OPTIMIZATION = {
-    "code": "def factorial(n):\n    if n == 0: return 1\n    return n * factorial(n-1)",
-    "optimization_target": "performance",
-    "language": "python",
+
+@pytest.fixture(autouse=True)
+def reset_main_state(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[None, None, None]:
+    """Keep cached results and shared clients from leaking between tests."""
+    monkeypatch.setattr(src.main, "_orchestrator", None)
+    monkeypatch.setattr(src.main, "_inflight", {})
+    prompt_cache.clear()
+    yield
+    prompt_cache.clear()
+
+
+# Predefined agent results, copied per call since hybrid_workflow adds metadata
+_WORKFLOW_RESPONSES: Dict[str, Dict[str, Any]] = {
+    "code_generation": {
+        "code": "def validate_email(email):\n    # Implementation\n    pass",
+        "language": "python",
+        "confidence": 0.85,
+    },
+    "code_optimization": {
+        "optimized_code": "def factorial(n):\n    result = 1\n    for i in range(1, n+1):\n        result *= i\n    return result",
+        "language": "python",
+        "improvements": ["Recursive to iterative", "Reduced stack usage"],
+        "estimated_speedup": "50%",
+    },
 }
+_UNKNOWN_TASK_RESPONSE: Dict[str, Any] = {"error": "Unknown task type"}
 
 
-@pytest.fixture
-def mock_setup_agents() -> Generator[MagicMock, None, None]:
-    """Fixture to mock the setup_agents function."""
-    with patch("src.main.setup_agents") as mock:
-        # Create a mock agent orchestrator
-        mock_orchestrator = MagicMock()
-
-        # Configure the mock to return a predefined result
-        def mock_workflow(task_type: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
-            if task_type == "code_generation":
-                return {
-                    "code": "def validate_email(email):\n    # Implementation\n    pass",
-                    "language": "python",
-                    "confidence": 0.85,
-                }
-            elif task_type == "code_optimization":
-                return {
-                    "optimized_code": "def factorial(n):\n    result = 1\n    for i in range(1, n+1):\n        result *= i\n    return result",
-                    "language": "python",
-                    "improvements": ["Recursive to iterative", "Reduced stack usage"],
-                    "estimated_speedup": "50%",
-                }
-            else:
-                return {"error": "Unknown task type"}
-
-        mock_orchestrator.create_workflow.side_effect = mock_workflow
-        mock.return_value = mock_orchestrator
-        yield mock
+@pytest.fixture(scope="module")
+def _setup_agents_patch() -> Generator[MagicMock, None, None]:
+    """Patch setup_agents once for the whole module."""
+    patcher = patch("src.main.setup_agents")
+    yield patcher.start()
+    patcher.stop()
 
 
 @pytest.fixture
-def mock_gpu_available() -> MagicMock:
+def mock_setup_agents(_setup_agents_patch: MagicMock) -> MagicMock:
+    """Fixture to mock the setup_agents function.
+
+    The patch is shared by the module; each test gets a fresh mock orchestrator
+    so return_value, side_effect and send_event overrides do not leak.
+    """
+    mock_orchestrator = MagicMock()
+    mock_orchestrator.create_workflow.side_effect = lambda task_type, task_data: dict(
+        _WORKFLOW_RESPONSES.get(task_type, _UNKNOWN_TASK_RESPONSE)
+    )
+    _setup_agents_patch.reset_mock()
+    _setup_agents_patch.return_value = mock_orchestrator
+    return _setup_agents_patch
+
+
+@pytest.fixture(scope="module")
+def mock_gpu_available() -> Generator[MagicMock, None, None]:
     """Fixture to mock the is_gpu_available function."""
-    with patch("src.main.is_gpu_available", return_value=True) as mock:
-        yield mock
+    patcher = patch("src.main.is_gpu_available", return_value=True)
+    yield patcher.start()
+    patcher.stop()
 
 
-@pytest.fixture
-def mock_get_version_info() -> MagicMock:
+@pytest.fixture(scope="module")
+def mock_get_version_info() -> Generator[MagicMock, None, None]:
     """Fixture to mock the get_version_info function."""
-    with patch("src.main.get_version_info") as mock:
-        mock.return_value = {"system": "Linux", "python": "3.9.5", "fusion_ai": "1.0.0"}
-        yield mock
+    patcher = patch("src.main.get_version_info")
+    mock = patcher.start()
+    mock.return_value = {"system": "Linux", "python": "3.9.5", "fusion_ai": "1.0.0"}
+    yield mock
+    patcher.stop()
 
 
 def test_hybrid_workflow_code_generation(
@@ -82,9 +118,7 @@ def test_hybrid_workflow_code_generation(
     }
 
     # Call the function under test with run_workflow which handles the async nature
-    from src.main import run_workflow
-
-    result = run_workflow("code_generation", TEST_TASK_CODE_GENERATION)
+    result = run_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
 
     # Assertions
     assert result is not None
@@ -112,9 +146,7 @@ def test_hybrid_workflow_code_optimization(
     }
 
     # Call the function under test with run_workflow which handles the async nature
-    from src.main import run_workflow
-
-    result = run_workflow("code_optimization", TEST_TASK_CODE_OPTIMIZATION)
+    result = run_workflow("code_optimization", dict(TEST_TASK_CODE_OPTIMIZATION))
 
     # Assertions
     assert result is not None
@@ -133,9 +165,7 @@ def test_hybrid_workflow_error_handling(mock_setup_agents: MagicMock) -> None:
     mock_setup_agents.return_value.create_workflow.side_effect = Exception("Test error")
 
     # Call the function under test using run_workflow to handle async
-    from src.main import run_workflow
-
-    result = run_workflow("code_generation", TEST_TASK_CODE_GENERATION)
+    result = run_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
 
     # Assertions
     assert result is not None
@@ -144,6 +174,172 @@ def test_hybrid_workflow_error_handling(mock_setup_agents: MagicMock) -> None:
     assert result["metadata"]["success"] is False
 
 
+def test_hybrid_workflow_prompt_cache(mock_setup_agents: MagicMock) -> None:
+    """Test repeated requests are served from the prompt cache."""
+    mock_setup_agents.return_value.send_event = AsyncMock()
+
+    first = run_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
+    second = run_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
+
+    assert "code" in first
+    assert second["code"] == first["code"]
+    assert second["metadata"]["cache_hit"] is True
+    assert mock_setup_agents.return_value.create_workflow.call_count == 1
+
+    run_workflow("code_generation", {**TEST_TASK_CODE_GENERATION, "no_cache": True})
+    assert mock_setup_agents.return_value.create_workflow.call_count == 2
+
+
+def test_hybrid_workflow_prompt_cache_isolated(mock_setup_agents: MagicMock) -> None:
+    """Test mutating a returned result never changes the cached entry."""
+    mock_setup_agents.return_value.send_event = AsyncMock()
+
+    first = run_workflow("code_optimization", dict(TEST_TASK_CODE_OPTIMIZATION))
+    first["improvements"].append("mutated")
+    second = run_workflow("code_optimization", dict(TEST_TASK_CODE_OPTIMIZATION))
+    second["improvements"].clear()
+    second["metadata"]["mutated"] = True
+    third = run_workflow("code_optimization", dict(TEST_TASK_CODE_OPTIMIZATION))
+
+    assert third["improvements"] == ["Recursive to iterative", "Reduced stack usage"]
+    assert "mutated" not in third["metadata"]
+    assert mock_setup_agents.return_value.create_workflow.call_count == 1
+
+
+def test_hybrid_workflow_prompt_cache_key(mock_setup_agents: MagicMock) -> None:
+    """Test the cache key covers the code and every output-changing option."""
+    mock_setup_agents.return_value.send_event = AsyncMock()
+    other_code = {**TEST_TASK_CODE_OPTIMIZATION, "code": "def f(x):\n    return x"}
+
+    run_workflow("code_optimization", dict(TEST_TASK_CODE_OPTIMIZATION))
+    run_workflow("code_optimization", other_code)
+    run_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
+    run_workflow("code_generation", {**TEST_TASK_CODE_GENERATION, "max_tokens": 50})
+
+    assert mock_setup_agents.return_value.create_workflow.call_count == 4
+
+
+def test_hybrid_workflow_prompt_cache_options(mock_setup_agents: MagicMock) -> None:
+    """Test requests differing only in options or raw prompt miss the cache."""
+    mock_setup_agents.return_value.send_event = AsyncMock()
+    task_data = {**TEST_TASK_CODE_OPTIMIZATION, "options": {"target": "memory"}}
+
+    run_workflow("code_optimization", dict(TEST_TASK_CODE_OPTIMIZATION))
+    run_workflow("code_optimization", task_data)
+    run_workflow("code_optimization", {**task_data, "use_gpu": True})
+    run_workflow(
+        "code_generation",
+        {**TEST_TASK_CODE_GENERATION, "prompt": "Create  a function"},
+    )
+    run_workflow(
+        "code_generation",
+        {**TEST_TASK_CODE_GENERATION, "prompt": "Create a function"},
+    )
+    assert mock_setup_agents.return_value.create_workflow.call_count == 5
+
+    run_workflow("code_optimization", {**task_data, "no_cache": False})
+    assert mock_setup_agents.return_value.create_workflow.call_count == 5
+
+
+def test_hybrid_workflow_direct_response(mock_setup_agents: MagicMock) -> None:
+    """Test empty and trivial tasks never reach the agents."""
+    result = run_workflow("code_generation", {"prompt": "  "})
+    assert result["error"] == "Empty prompt"
+
+    result = run_workflow("code_optimization", {"code": "x = 1"})
+    assert result["optimized_code"] == "x = 1"
+    assert result["metadata"]["direct_response"] is True
+    mock_setup_agents.return_value.create_workflow.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "task_data, error",
+    [
+        ({"prompt": None}, "Empty prompt"),
+        ({"prompt": "Sort a list", "temperature": "hot"}, "Invalid temperature"),
+    ],
+)
+def test_hybrid_workflow_invalid_task_data(
+    mock_setup_agents: MagicMock, task_data: Dict[str, Any], error: str
+) -> None:
+    """Test malformed task data returns an error instead of raising."""
+    result = run_workflow("code_generation", task_data)
+    assert error in result["error"]
+    mock_setup_agents.return_value.create_workflow.assert_not_called()
+
+
+def test_run_workflow_reuses_event_loop(mock_setup_agents: MagicMock) -> None:
+    """Test synchronous calls share one event loop."""
+    loops = []
+
+    async def record_loop(**_: Any) -> None:
+        loops.append(asyncio.get_running_loop())
+
+    mock_setup_agents.return_value.send_event = record_loop
+    run_workflow("code_generation", {**TEST_TASK_CODE_GENERATION, "no_cache": True})
+    run_workflow("code_generation", {**TEST_TASK_CODE_GENERATION, "no_cache": True})
+
+    assert len(loops) == 4
+    assert all(loop is loops[0] for loop in loops)
+
+
+def test_run_workflow_per_thread_loop(mock_setup_agents: MagicMock) -> None:
+    """Test each thread gets its own loop and threads are not serialized."""
+    loops = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    async def record_loop(**_: Any) -> None:
+        loops.append(asyncio.get_running_loop())
+        await asyncio.to_thread(barrier.wait)
+
+    mock_setup_agents.return_value.send_event = record_loop
+    task_data = {**TEST_TASK_CODE_GENERATION, "no_cache": True}
+    threads = [
+        threading.Thread(target=run_workflow, args=("code_generation", task_data))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loops) == 4
+    assert len(set(map(id, loops))) == 2
+
+
+@pytest.mark.asyncio
+async def test_hybrid_workflow_parallel_execution(
+    mock_setup_agents: MagicMock,
+) -> None:
+    """Test the parallel branch returns the first usable result."""
+    release = threading.Event()
+    local_finished = threading.Event()
+
+    def local(*_: Any) -> Dict[str, Any]:
+        release.wait(5)
+        local_finished.set()
+        return {"code": "local"}
+
+    orchestrator = mock_setup_agents.return_value
+    orchestrator.send_event = AsyncMock()
+    orchestrator.create_workflow.side_effect = local
+    foundry = MagicMock()
+    foundry.process_code_generation = AsyncMock(return_value={"code": "cloud"})
+
+    try:
+        with patch("src.main._get_foundry", return_value=foundry):
+            result = await hybrid_workflow(
+                "code_generation",
+                {**TEST_TASK_CODE_GENERATION, "parallel_execution": True},
+            )
+        # The cloud result won without waiting for the blocked local agents
+        assert not local_finished.is_set()
+    finally:
+        release.set()
+
+    assert result["code"] == "cloud"
+
+
 def test_batch_process(
     mock_setup_agents: MagicMock,
     mock_gpu_available: MagicMock,
@@ -152,13 +348,11 @@ def test_batch_process(
     """Test the batch_process function."""
     # Prepare test data
     tasks = [
-        {"type": "code_generation", "data": TEST_TASK_CODE_GENERATION},
-        {"type": "code_optimization", "data": TEST_TASK_CODE_OPTIMIZATION},
+        {"type": "code_generation", "data": dict(TEST_TASK_CODE_GENERATION)},
+        {"type": "code_optimization", "data": dict(TEST_TASK_CODE_OPTIMIZATION)},
     ]
 
     # Call the function under test using run_batch_process instead of direct async call
-    from src.main import run_batch_process
-
     results = run_batch_process(tasks)
 
     # Assertions
@@ -168,7 +362,7 @@ def test_batch_process(
     assert "optimized_code" in results[1] or "error" in results[1]
 
     # Test with missing task_type
-    tasks = [{"data": TEST_TASK_CODE_GENERATION}]
+    tasks = [{"data": dict(TEST_TASK_CODE_GENERATION)}]
     results = run_batch_process(tasks)
     assert results is not None
     assert len(results) == 1
@@ -201,3 +395,76 @@ async def test_azure_foundry_code_optimization(mock_setup_agents: MagicMock) ->
     )
     assert "optimized_code" in result
     assert result["language"] == "python"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_workflow_cloud_timeout(mock_setup_agents: MagicMock) -> None:
+    """Test a hung cloud provider falls back to local agents after cloud_timeout."""
+    mock_setup_agents.return_value.send_event = AsyncMock()
+
+    async def hang(*_: Any, **__: Any) -> Dict[str, Any]:
+        await asyncio.sleep(10)
+        return {"code": "cloud"}
+
+    foundry = MagicMock()
+    foundry.process_code_generation = hang
+
+    with patch("src.main._get_foundry", return_value=foundry):
+        start = time.monotonic()
+        result = await hybrid_workflow(
+            "code_generation",
+            {**TEST_TASK_CODE_GENERATION, "complexity": "high", "cloud_timeout": 0.05},
+        )
+
+    assert "validate_email" in result["code"]
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_hybrid_workflow_single_flight(mock_setup_agents: MagicMock) -> None:
+    """Test identical concurrent requests share one workflow run."""
+    orchestrator = mock_setup_agents.return_value
+    orchestrator.send_event = AsyncMock()
+    orchestrator.create_workflow.side_effect = lambda *_: time.sleep(0.1) or {
+        "code": "local"
+    }
+
+    results = await asyncio.gather(
+        *(
+            hybrid_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
+            for _ in range(5)
+        )
+    )
+
+    assert all(result["code"] == "local" for result in results)
+    assert orchestrator.create_workflow.call_count == 1
+    assert not src.main._inflight
+
+
+@pytest.mark.asyncio
+async def test_hybrid_workflow_single_flight_owner_cancelled(
+    mock_setup_agents: MagicMock,
+) -> None:
+    """Test a joiner takes over when the workflow it joined is cancelled."""
+    orchestrator = mock_setup_agents.return_value
+    orchestrator.send_event = AsyncMock()
+    orchestrator.create_workflow.side_effect = lambda *_: time.sleep(0.1) or {
+        "code": "local"
+    }
+
+    owner = asyncio.create_task(
+        hybrid_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
+    )
+    await asyncio.sleep(0.01)
+    joiner = asyncio.create_task(
+        hybrid_workflow("code_generation", dict(TEST_TASK_CODE_GENERATION))
+    )
+    await asyncio.sleep(0.01)
+    owner.cancel()
+
+    result = await joiner
+    assert result["code"] == "local"
+    assert owner.cancelled()
+    assert orchestrator.create_workflow.call_count == 2
+    assert not src.main._inflight
+
@@ -0,0 +1,162 @@
+"""Test the mock Azure AI Foundry client."""
+
+from typing import Dict, Any, List
+import asyncio
+import threading
+from pathlib import Path
+import pytest  # type: ignore
+from unittest.mock import patch, MagicMock  # type: ignore
+
+from src.mocks.azure_ai_foundry import FoundryClient
+
+
+@patch("src.mocks.azure_ai_foundry.time.sleep")
+def test_response_cache(mock_sleep: MagicMock) -> None:
+    """Test repeated requests skip the simulated delay and evict LRU entries."""
+    client = FoundryClient()
+    client.cache_size = 2
+
+    first: Dict[str, Any] = client.generate_code("sort a list", "python")
+    first["code"] = "mutated"
+    second: Dict[str, Any] = client.generate_code("sort a list", "python")
+    assert second["code"] != "mutated"
+    assert mock_sleep.call_count == 1
+
+    client.optimize_code("x = 1", "memory")
+    client.optimize_code("y = 2", "memory")
+    client.generate_code("sort a list", "python")
+    assert mock_sleep.call_count == 4
+
+
+@patch("src.mocks.azure_ai_foundry.time.sleep")
+def test_batch_sleeps_once(mock_sleep: MagicMock) -> None:
+    """Test batch calls pay the simulated delay once and reuse cached entries."""
+    client = FoundryClient()
+    client.generate_code("cached prompt", "python")
+
+    results: List[Dict[str, Any]] = client.generate_code_batch(
+        ["cached prompt", "new prompt", "another prompt"], "python"
+    )
+    assert [r["prompt_tokens"] for r in results] == [2, 2, 2]
+    assert results[1]["generated_at"] == results[2]["generated_at"]
+    assert mock_sleep.call_count == 2
+
+    optimized: List[Dict[str, Any]] = client.optimize_code_batch(["a = 1", "b = 2"])
+    assert [r["original_code"] for r in optimized] == ["a = 1", "b = 2"]
+    assert mock_sleep.call_count == 3
+
+
+@patch("src.mocks.azure_ai_foundry.time.sleep")
+def test_latency_simulation(mock_sleep: MagicMock) -> None:
+    """Test the simulated delay can be disabled or scaled."""
+    FoundryClient(simulate_latency=False).generate_code("prompt")
+    mock_sleep.assert_not_called()
+
+    FoundryClient(latency_scale=0.0).generate_code("prompt")
+    mock_sleep.assert_called_once_with(0.0)
+
+
+@patch("src.mocks.azure_ai_foundry.time.sleep")
+def test_fast_mode_env(mock_sleep: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test FUSION_MOCK_FAST=1 disables the delay unless latency is requested."""
+    monkeypatch.setenv("FUSION_MOCK_FAST", "1")
+    FoundryClient().generate_code("prompt")
+    mock_sleep.assert_not_called()
+
+    FoundryClient(simulate_latency=True, latency_scale=0.0).generate_code("prompt")
+    mock_sleep.assert_called_once_with(0.0)
+
+
+def test_python_memoization_header() -> None:
+    """Test lru_cache is only emitted before a top-level function."""
+    client = FoundryClient(simulate_latency=False)
+    optimized: str = client.optimize_code("def f(n):\n    return n")["optimized_code"]
+    assert "@functools.lru_cache(maxsize=128)\ndef f(n):" in optimized
+    compile(optimized, "<optimized>", "exec")
+
+    optimized = client.optimize_code("x = [1, 2]")["optimized_code"]
+    assert "lru_cache" not in optimized
+    compile(optimized, "<optimized>", "exec")
+
+
+def test_response_cache_concurrent_access() -> None:
+    """Test worker threads sharing a client never corrupt the LRU."""
+    client = FoundryClient(simulate_latency=False)
+    client.cache_size = 8
+    errors: List[BaseException] = []
+
+    def worker(offset: int) -> None:
+        try:
+            for i in range(500):
+                client.optimize_code(f"x = {(offset + i) % 32}", "memory")
+        except BaseException as e:
+            errors.append(e)
+
+    threads: List[threading.Thread] = [
+        threading.Thread(target=worker, args=(n,)) for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(client._cache) == 8
+
+
+@pytest.mark.asyncio
+async def test_async_calls_overlap(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test concurrent async calls wait out their delays together."""
+    client = FoundryClient(simulate_latency=True)
+    real_sleep = asyncio.sleep
+    sleeping: int = 0
+    peak: int = 0
+
+    async def sleep(delay: float) -> None:
+        nonlocal sleeping, peak
+        sleeping += 1
+        peak = max(peak, sleeping)
+        await real_sleep(0.01)
+        sleeping -= 1
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    results = await asyncio.gather(
+        *(client.generate_code_async(f"prompt {i}") for i in range(5)),
+        client.optimize_code_async("x = 1"),
+    )
+
+    assert all(result["success"] for result in results)
+    # Every call was inside its delay at once, so none blocked the loop
+    assert peak == 6
+
+
+@patch("src.mocks.azure_ai_foundry.time.sleep")
+def test_disk_cache(mock_sleep: MagicMock, tmp_path: Path) -> None:
+    """Test responses persisted to disk are reused by a new client."""
+    cache_path: str = str(tmp_path / "mock_cache")
+    writer = FoundryClient(cache_path=cache_path)
+    first: Dict[str, Any] = writer.optimize_code("x = 1", "memory")
+    writer.close()
+
+    reader = FoundryClient(cache_path=cache_path)
+    second: Dict[str, Any] = reader.optimize_code("x = 1", "memory")
+    reader.close()
+
+    assert second == first
+    assert mock_sleep.call_count == 1
+
+
+@patch("src.mocks.azure_ai_foundry.time.sleep")
+def test_batch_deduplicates(mock_sleep: MagicMock) -> None:
+    """Test duplicate batch entries are built once and returned as copies."""
+    client = FoundryClient()
+    with patch.object(
+        client, "_build_optimization", wraps=client._build_optimization
+    ) as build:
+        results: List[Dict[str, Any]] = client.optimize_code_batch(
+            ["a = 1", "b = 2", "a = 1"]
+        )
+
+    assert build.call_count == 2
+    assert results[0] == results[2]
+    assert results[0] is not results[2]
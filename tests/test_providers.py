@@ -0,0 +1,52 @@
+"""Test the cloud provider fallback chain."""
+
+from typing import Dict, Any
+import asyncio
+import orjson
+from unittest.mock import AsyncMock, MagicMock
+import pytest  # type: ignore
+
+from src.integration.providers import try_providers
+
+
+@pytest.mark.asyncio
+async def test_try_providers_fallback() -> None:
+    """Test failing and slow providers fall through to the next one."""
+    async def slow(*_: Any, **__: Any) -> Dict[str, Any]:
+        await asyncio.sleep(1)
+        return {"code": "slow"}
+
+    erroring = MagicMock()
+    erroring.process_code_generation = AsyncMock(return_value={"error": "HTTP 503"})
+    hanging = MagicMock()
+    hanging.process_code_generation = slow
+    working = MagicMock()
+    working.process_code_generation = AsyncMock(return_value={"code": "ok"})
+
+    result: Dict[str, Any] = await try_providers(
+        [erroring, hanging, working], "code_generation", "p", {}, 0.05
+    )
+    assert result == {"code": "ok"}
+
+    result = await try_providers([erroring], "code_generation", "p", {})
+    assert "HTTP 503" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_try_providers_decode_error() -> None:
+    """Test a provider raising ValueError (e.g. bad JSON) is just a failed hop."""
+    malformed = MagicMock()
+    malformed.process_code_generation = AsyncMock(
+        side_effect=lambda **_: orjson.loads(b"{")
+    )
+    working = MagicMock()
+    working.process_code_generation = AsyncMock(return_value={"code": "ok"})
+
+    result: Dict[str, Any] = await try_providers(
+        [malformed, working], "code_generation", "p", {}
+    )
+    assert result == {"code": "ok"}
+
+    with pytest.raises(ValueError):
+        await try_providers([working], "code_review", "p", {})
+    assert working.process_code_generation.await_count == 1
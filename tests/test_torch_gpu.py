@@ -0,0 +1,28 @@
+"""Test PyTorch GPU functionality."""
+
+from typing import TYPE_CHECKING, Tuple
+import pytest  # type: ignore
+
+if TYPE_CHECKING:
+    import torch  # type: ignore
+
+
+@pytest.fixture(scope="session")
+def cuda_tensors() -> Tuple["torch.Tensor", "torch.Tensor"]:
+    """Provide a pair of random GPU tensors shared by the session."""
+    torch = pytest.importorskip("torch")
+    if not torch.cuda.is_available():
+        pytest.skip("CUDA not available")
+    return torch.rand(5, 3).cuda(), torch.rand(5, 3).cuda()
+
+
+def test_gpu_operations(cuda_tensors: Tuple["torch.Tensor", "torch.Tensor"]) -> None:
+    """Test GPU tensor operations."""
+    x, y = cuda_tensors
+
+    z: "torch.Tensor" = x + y
+    assert z.is_cuda
+    assert z.shape == (5, 3)
+
+    cpu_tensor: "torch.Tensor" = z.cpu()
+    assert not cpu_tensor.is_cuda
@@ -1,6 +1,6 @@
 """Test PyTorch installation and GPU functionality."""
 
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Tuple
 import pytest  # type: ignore
 import numpy as np  # type: ignore
 from numpy.testing import assert_array_equal  # type: ignore
@@ -8,28 +8,40 @@ from numpy.typing import NDArray  # type: ignore
 
 from src.utils import is_gpu_available, get_gpu_info
 
-import torch  # type: ignore
-import torchvision  # type: ignore
-import torchaudio  # type: ignore
+if TYPE_CHECKING:
+    import torch  # type: ignore
+
+
+@pytest.fixture(scope="session")
+def sample_tensors() -> Tuple["torch.Tensor", "torch.Tensor"]:
+    """Provide a pair of random tensors shared by the session."""
+    import torch  # type: ignore
+
+    return torch.rand(5, 3), torch.rand(5, 3)
 
 
 def test_torch_import() -> None:
     """Test that PyTorch can be imported."""
+    import torch  # type: ignore
+
     assert torch.__version__
     assert hasattr(torch, "cuda")
 
 
-def test_basic_operations() -> tuple[torch.Tensor, NDArray[Any]]:
+def test_basic_operations(
+    sample_tensors: Tuple["torch.Tensor", "torch.Tensor"],
+) -> Tuple["torch.Tensor", NDArray[Any]]:
     """Test basic PyTorch operations."""
-    x: torch.Tensor = torch.rand(5, 3)
-    y: torch.Tensor = torch.rand(5, 3)
-    z: torch.Tensor = x + y
+    x, y = sample_tensors
+    z: "torch.Tensor" = x + y
     numpy_array: NDArray[Any] = z.numpy()
     return z, numpy_array
 
 
 def test_numpy_interop() -> None:
     """Test NumPy interoperability."""
+    import torch  # type: ignore
+
     numpy_array: np.ndarray = np.random.rand(5, 3)
     tensor: torch.Tensor = torch.from_numpy(numpy_array)
     assert isinstance(tensor, torch.Tensor)
@@ -49,17 +61,3 @@ def test_gpu_detection() -> None:
     assert isinstance(gpu_info["available"], bool)
     assert isinstance(gpu_info["count"], int)
     assert gpu_info["available"] == gpu_available
-
-
-@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
-def test_gpu_operations() -> None:
-    """Test GPU tensor operations."""
-    x: torch.Tensor = torch.rand(5, 3).cuda()
-    y: torch.Tensor = torch.rand(5, 3).cuda()
-
-    z: torch.Tensor = x + y
-    assert z.is_cuda
-    assert z.shape == (5, 3)
-
-    cpu_tensor: torch.Tensor = z.cpu()
-    assert not cpu_tensor.is_cuda
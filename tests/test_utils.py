@@ -1,9 +1,11 @@
 """Test utilities and helper functions."""
 
-from typing import Dict, Any, Generator
+from typing import Dict, Any, List
+from typing_extensions import TypedDict
 import pytest  # type: ignore
+from pydantic import TypeAdapter  # type: ignore
+from typeguard import TypeCheckError  # type: ignore
 import logging
-import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock  # type: ignore
 
@@ -11,69 +13,141 @@ from src.utils import (
     setup_logging,
     get_gpu_info,
     get_version_info,
+    invalidate_capabilities,
+    is_gpu_available,
     read_config,
     save_config,
 )
+from src.utils.type_check import coerce_type, strict_types
 from src.types import ConfigDict
 
 
-@pytest.fixture
-def temp_config_file() -> Generator[Path, None, None]:
-    """Create a temporary config file and yield the path."""
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
-        temp_file.write(b"{}")  # Write empty JSON
-        temp_path = Path(temp_file.name)
+class _GPUInfo(TypedDict):
+    """Expected shape of get_gpu_info()."""
+
+    available: bool
+    count: int
+    devices: List[Dict[str, Any]]
+
+
+class _VersionInfo(TypedDict):
+    """Required keys of get_version_info()."""
+
+    version: str
+    build_date: str
+
+
+# Built once; each check is a single strict validation call
+_GPU_INFO_SCHEMA: TypeAdapter[_GPUInfo] = TypeAdapter(_GPUInfo)
+_VERSION_INFO_SCHEMA: TypeAdapter[_VersionInfo] = TypeAdapter(_VersionInfo)
 
-    try:
-        yield temp_path
-    finally:
-        if temp_path.exists():
-            temp_path.unlink()
 
+@pytest.fixture(scope="module")
+def _config_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide one temporary config path shared by the module."""
+    return tmp_path_factory.mktemp("cfg") / "config.json"
 
-def test_setup_logging() -> None:
+
+@pytest.fixture
+def temp_config_file(_config_path: Path) -> Path:
+    """Reset the shared temporary config file and return the path."""
+    _config_path.write_bytes(b"{}")  # Write empty JSON
+    return _config_path
+
+
+def test_setup_logging(tmp_path: Path) -> None:
     """Test logging setup."""
     logger = setup_logging(level="DEBUG")
     assert logger.level == 10  # DEBUG level
+    assert logger.propagate is False
 
-    with tempfile.NamedTemporaryFile(suffix=".log") as tf:
-        log_file = Path(tf.name)
-        logger = setup_logging(level="INFO", log_file=str(log_file))
-        assert logger.level == 20  # INFO level
-        assert any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+    log_file: Path = tmp_path / "test.log"
+    logger = setup_logging(level="INFO", log_file=str(log_file))
+    assert logger.level == 20  # INFO level
+    assert any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+
+    handler_count: int = len(logger.handlers)
+    setup_logging(level="INFO", log_file=str(log_file))
+    assert len(logger.handlers) == handler_count
 
 
 def test_gpu_info() -> None:
     """Test GPU information retrieval."""
     gpu_info: Dict[str, Any] = get_gpu_info()
-    assert isinstance(gpu_info, dict)
-    assert "available" in gpu_info
-    assert isinstance(gpu_info["available"], bool)
-    assert isinstance(gpu_info["count"], int)
-    assert isinstance(gpu_info["devices"], list)
+    _GPU_INFO_SCHEMA.validate_python(gpu_info, strict=True)
+
+
+def test_gpu_info_caches_devices(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test device properties are read once while allocated memory stays live."""
+    monkeypatch.setenv("ENABLE_GPU_ACCELERATION", "true")
+    invalidate_capabilities()
+    with patch("torch.cuda") as cuda:
+        cuda.is_available.return_value = True
+        cuda.device_count.return_value = 1
+        cuda.get_device_name.return_value = "Mock GPU"
+        cuda.get_device_properties.return_value.total_memory = 1024
+        cuda.memory_allocated.side_effect = [10, 20]
+
+        first: Dict[str, Any] = get_gpu_info()
+        second: Dict[str, Any] = get_gpu_info()
+
+    assert first["count"] == 1
+    assert first["devices"][0]["name"] == "Mock GPU"
+    assert first["devices"][0]["free_memory"] == 10
+    assert second["devices"][0]["free_memory"] == 20
+    assert cuda.get_device_name.call_count == 1
+    invalidate_capabilities()
 
 
 def test_version_info() -> None:
     """Test version information retrieval."""
     version_info: Dict[str, str] = get_version_info()
-    assert isinstance(version_info, dict)
-    assert "version" in version_info
-    assert isinstance(version_info["version"], str)
-    assert "build_date" in version_info
+    _VERSION_INFO_SCHEMA.validate_python(version_info, strict=True)
+
+
+def test_invalidate_capabilities(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test GPU availability is cached until explicitly invalidated."""
+    monkeypatch.setenv("ENABLE_GPU_ACCELERATION", "false")
+    invalidate_capabilities()
+    assert is_gpu_available() is False
 
+    monkeypatch.setenv("ENABLE_GPU_ACCELERATION", "true")
+    with patch("torch.cuda.is_available", return_value=True):
+        assert is_gpu_available() is False
+        invalidate_capabilities()
+        assert is_gpu_available() is True
 
-def test_config_operations() -> None:
+    invalidate_capabilities()
+
+
+def test_config_operations(temp_config_file: Path) -> None:
     """Test configuration file operations."""
     test_config: ConfigDict = {"test_key": "test_value", "nested": {"key": "value"}}
 
-    # Create a temporary file for testing
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
-        temp_path = Path(temp_file.name)
-
-    try:
-        save_config(test_config, temp_path)
-        loaded_config: ConfigDict = read_config(temp_path)
-        assert loaded_config == test_config
-    finally:
-        if temp_path.exists():
-            temp_path.unlink()
+    assert read_config(temp_config_file) == {}
+    save_config(test_config, temp_config_file)
+    loaded_config: ConfigDict = read_config(temp_config_file)
+    assert loaded_config == test_config
+
+    # JSON object keys are strings; non-str keys are written in string form
+    save_config({1: "a", "nested": {2.5: "b"}}, temp_config_file)
+    assert read_config(temp_config_file) == {"1": "a", "nested": {"2.5": "b"}}
+
+
+def test_coerce_type() -> None:
+    """Test type_check helpers are importable from the src.utils package."""
+    assert coerce_type("3", int) == 3
+    with pytest.raises(TypeError):
+        coerce_type("x", int)
+
+
+def test_strict_types() -> None:
+    """Test strict_types rejects wrongly typed calls at runtime."""
+
+    @strict_types
+    def double(value: int) -> int:
+        return value * 2
+
+    assert double(2) == 4
+    with pytest.raises(TypeCheckError):
+        double("2")  # type: ignore[arg-type]
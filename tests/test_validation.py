@@ -1,5 +1,5 @@
 """Test validation utilities."""
-from typing import Dict, Any, List
+from typing import Dict, Any
 import pytest
 from pathlib import Path
 
@@ -51,6 +51,16 @@ def test_validate_file_path(tmp_path: Path) -> None:
     with pytest.raises(ConfigurationError):
         validate_file_path("/nonexistent/path/file.txt")
 
+    # The parent is checked on every call, so creating or deleting it is seen
+    new_file: Path = tmp_path / "new" / "test.txt"
+    with pytest.raises(ConfigurationError):
+        validate_file_path(new_file)
+    new_file.parent.mkdir()
+    assert validate_file_path(new_file) == new_file
+    new_file.parent.rmdir()
+    with pytest.raises(ConfigurationError):
+        validate_file_path(new_file)
+
 def test_validate_type() -> None:
     """Test type validation."""
     assert validate_type("test", str) == "test"
@@ -59,38 +69,46 @@ def test_validate_type() -> None:
     with pytest.raises(ConfigurationError):
         validate_type("test", int)
 
-def test_validate_email() -> None:
-    """Test email validation."""
-    valid_emails: List[str] = [
-        "test@example.com",
-        "user.name@domain.co.uk",
-        "user+label@example.com"
-    ]
-    
-    invalid_emails: List[str] = [
-        "invalid_email",
-        "@domain.com",
-        "user@",
-        "user@.com"
-    ]
-    
-    for email in valid_emails:
-        assert validate_email(email) == email
-    
-    for email in invalid_emails:
-        with pytest.raises(ConfigurationError):
-            validate_email(email)
+@pytest.mark.parametrize("email", [
+    "test@example.com",
+    "user.name@domain.co.uk",
+    "user+label@example.com"
+])
+def test_validate_email_valid(email: str) -> None:
+    """Test valid email addresses are accepted."""
+    assert validate_email(email) == email
 
-def test_validate_port() -> None:
-    """Test port validation."""
-    assert validate_port(8080) == 8080
-    assert validate_port(1) == 1
-    assert validate_port(65535) == 65535
-    
+@pytest.mark.parametrize("email", [
+    "invalid_email",
+    "@domain.com",
+    "user@",
+    "user@.com",
+    "user@domain.c",
+    "a@b@example.com",
+    "user@example.com\n"
+])
+def test_validate_email_invalid(email: str) -> None:
+    """Test malformed email addresses are rejected."""
     with pytest.raises(ConfigurationError):
-        validate_port(-1)
+        validate_email(email)
+
+@pytest.mark.parametrize("port", [8080, 1, 65535])
+def test_validate_port_valid(port: int) -> None:
+    """Test ports in range are accepted."""
+    assert validate_port(port) == port
+
+@pytest.mark.parametrize("port", [-1, 65536])
+def test_validate_port_invalid(port: int) -> None:
+    """Test ports out of range are rejected."""
     with pytest.raises(ConfigurationError):
-        validate_port(65536)
+        validate_port(port)
+
+def test_validate_port_cache_typed() -> None:
+    """Test equal values of different types do not share a cache entry."""
+    validate_port.cache_clear()
+    assert type(validate_port(1)) is int
+    assert validate_port(True) is True
+    assert type(validate_port(1.0)) is float
 
 def test_validate_config() -> None:
     """Test configuration validation."""
@@ -53,12 +53,12 @@ def test_torch_installation() -> bool:
     try:
         # Get versions
         version_info: TorchVersionInfo = get_version_info()
-        print(f"PyTorch Version: {version_info['torch_version']}")
-        print(f"TorchVision Version: {version_info['torchvision_version']}")
-        print(f"TorchAudio Version: {version_info['torchaudio_version']}")
-        print(f"CUDA Available: {version_info['cuda_available']}")
-        if version_info["cuda_available"]:
-            print(f"Device Info: {version_info['device_info']}")
+        print(f"PyTorch Version: {version_info.torch_version}")
+        print(f"TorchVision Version: {version_info.torchvision_version}")
+        print(f"TorchAudio Version: {version_info.torchaudio_version}")
+        print(f"CUDA Available: {version_info.cuda_available}")
+        if version_info.cuda_available:
+            print(f"Device Info: {version_info.device_info}")
 
         # Test operations
         tensor, array = test_basic_operations()
@@ -67,9 +67,9 @@ def test_torch_installation() -> bool:
 
         # Check GPU
         gpu_status: GPUCheckResult = test_gpu_availability()
-        print(f"CUDA Available: {version_info['cuda_available']}")
-        if version_info["cuda_available"]:
-            print(f"Device: {version_info['device_info']['device_name']}")
+        print(f"CUDA Available: {version_info.cuda_available}")
+        if version_info.cuda_available:
+            print(f"Device: {version_info.device_info['device_name']}")
 
         return True
     except Exception as e: